@@ -1396,8 +1396,7 @@ class MainWindow(QMainWindow):
 
                 if file_path.endswith('.txt'):
                     with open(file_path, 'w', encoding='utf-8') as f:
-                        for phrase, freq in data:
-                            f.write(f"{phrase}\t{freq}\n")
+                        f.write(''.join(f"{phrase}\t{freq}\n" for phrase, freq in data))
                 elif file_path.endswith('.xlsx'):
                     df = pd.DataFrame(data, columns=['Фраза', 'Частотность'])
                     df.to_excel(file_path, index=False)
@@ -1604,8 +1604,7 @@ class MainWindow(QMainWindow):
 
                 if file_path.endswith('.txt'):
                     with open(file_path, 'w', encoding='utf-8') as f:
-                        for phrase in phrases:
-                            f.write(f"{phrase}\n")
+                        f.write(''.join(f"{phrase}\n" for phrase in phrases))
                 elif file_path.endswith('.xlsx'):
                     df = pd.DataFrame({'Фраза': phrases})
                     df.to_excel(file_path, index=False)
@@ -8,7 +8,6 @@ import sys
 import os
 import re
 import math
-import copy
 import json
 import hashlib
 import platform
@@ -16,18 +15,23 @@ import uuid
 import socket
 import base64
 import pickle
+import time
 from difflib import SequenceMatcher
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
+from typing import Callable, Iterable, List, Dict, Set, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
 from datetime import datetime, timedelta
-import pandas as pd
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFileDialog, QTabWidget, QSplitter,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMenu,
+    QTableView, QHeaderView, QMenu,
     QMessageBox, QListWidget, QGroupBox, QLineEdit,
     QComboBox, QProgressBar, QStatusBar, QTextEdit, QPlainTextEdit,
     QAbstractItemView, QTreeWidget, QTreeWidgetItem,
@@ -37,7 +41,7 @@ from PyQt5.QtWidgets import (
     QTabBar, QStylePainter, QStyleOptionTab, QColorDialog, QToolButton,
     QDialogButtonBox
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QPropertyAnimation, QEasingCurve, QMimeData, QEvent, QRect, QSettings
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QAbstractTableModel, QModelIndex, QPropertyAnimation, QEasingCurve, QMimeData, QEvent, QRect, QSettings
 from PyQt5.QtGui import (
     QFont, QPalette, QColor, QBrush, QLinearGradient,
     QKeySequence, QTextCharFormat, QTextCursor, QPainter,
@@ -80,8 +84,10 @@ class LicenseManager:
         try:
             if platform.system() == "Windows":
                 import subprocess
+                # Без CREATE_NO_WINDOW собранное оконное приложение на миг показывает консоль
                 result = subprocess.run(['wmic', 'csproduct', 'get', 'UUID'],
-                                        capture_output=True, text=True)
+                                        capture_output=True, text=True,
+                                        creationflags=subprocess.CREATE_NO_WINDOW)
                 if result.stdout:
                     lines = result.stdout.strip().split('\n')
                     if len(lines) > 1:
@@ -89,13 +95,26 @@ class LicenseManager:
                         components.append(system_uuid)
             elif platform.system() == "Darwin":  # macOS
                 import subprocess
-                result = subprocess.run(['system_profiler', 'SPHardwareDataType'],
-                                        capture_output=True, text=True)
-                for line in result.stdout.split('\n'):
-                    if 'Hardware UUID' in line:
-                        system_uuid = line.split(':')[1].strip()
-                        components.append(system_uuid)
-                        break
+                # ioreg отдает тот же Hardware UUID (IOPlatformUUID) в разы быстрее system_profiler
+                system_uuid = None
+                try:
+                    result = subprocess.run(['ioreg', '-rd1', '-c', 'IOPlatformExpertDevice'],
+                                            capture_output=True, text=True)
+                    for line in result.stdout.split('\n'):
+                        if '"IOPlatformUUID"' in line:
+                            system_uuid = line.split('=', 1)[1].strip().strip('"')
+                            break
+                except Exception:
+                    pass
+                if not system_uuid:
+                    result = subprocess.run(['system_profiler', 'SPHardwareDataType'],
+                                            capture_output=True, text=True)
+                    for line in result.stdout.split('\n'):
+                        if 'Hardware UUID' in line:
+                            system_uuid = line.split(':')[1].strip()
+                            break
+                if system_uuid:
+                    components.append(system_uuid)
             elif platform.system() == "Linux":
                 try:
                     with open('/sys/class/dmi/id/product_uuid', 'r') as f:
@@ -585,62 +604,211 @@ class Folder:
         self.name = name
         self.phrases: List[Tuple[str, int]] = []
         self.color = color
+        # Индекс self.phrases для проверки наличия; перестраивается, если список заменили
+        self._keys: Optional[Set[Tuple[str, int]]] = None
+        self._keys_source: Optional[List[Tuple[str, int]]] = None
+
+    def __getstate__(self):
+        # Индекс не сохраняется в сессию, он восстанавливается по списку фраз
+        state = self.__dict__.copy()
+        state.pop('_keys', None)
+        state.pop('_keys_source', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._keys = None
+        self._keys_source = None
+
+    def copy(self) -> 'Folder':
+        """Копия папки со своим списком фраз; кортежи фраз неизменяемы и не копируются"""
+        # В старых сессиях у папок нет атрибута color
+        folder = Folder(self.name, getattr(self, "color", None))
+        folder.phrases = list(self.phrases)
+        return folder
+
+    def _key_index(self) -> Set[Tuple[str, int]]:
+        keys = self._keys
+        if keys is None or self._keys_source is not self.phrases:
+            keys = set(self.phrases)
+            self._keys = keys
+            self._keys_source = self.phrases
+        return keys
 
     def add_phrase(self, phrase: str, frequency: int):
         """Добавление фразы в папку"""
-        if (phrase, frequency) not in self.phrases:
-            self.phrases.append((phrase, frequency))
+        keys = self._key_index()
+        key = (phrase, frequency)
+        if key not in keys:
+            keys.add(key)
+            self.phrases.append(key)
 
     def remove_phrase(self, phrase: str):
         """Удаление фразы из папки"""
-        self.phrases = [(p, f) for p, f in self.phrases if p != phrase]
+        removed = [item for item in self.phrases if item[0] == phrase]
+        if not removed:
+            return
+        # Список меняется на месте, поэтому индекс остается привязан к нему и правится точечно
+        self._key_index().difference_update(removed)
+        self.phrases[:] = [item for item in self.phrases if item[0] != phrase]
+
+    def remove_phrases(self, phrases: Set[str]):
+        """Удаление нескольких фраз за один проход по списку"""
+        removed = [item for item in self.phrases if item[0] in phrases]
+        if not removed:
+            return
+        self._key_index().difference_update(removed)
+        self.phrases[:] = [item for item in self.phrases if item[0] not in phrases]
 
     def clear(self):
         """Очистка папки"""
         self.phrases.clear()
+        self._keys = None
 
 
 class HistoryManager:
-    """Менеджер истории для undo/redo"""
+    """Менеджер истории для undo/redo.
+
+    Хранится только текущее состояние и патчи между соседними состояниями:
+    правка нескольких строк из большого списка занимает в истории место этих
+    строк, а не полного снимка.
+    """
+
+    # Общий префикс ищется блоками: сравнение срезов выполняется в C
+    PREFIX_BLOCK = 4096
 
     def __init__(self, max_history=50):
-        self.history = deque(maxlen=max_history)
+        self.max_history = max_history
+        self.patches = []  # patches[i] переводит состояние i в состояние i + 1
+        self.current_state = None
         self.current_index = -1
         self.initial_state = None
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if 'patches' in state:
+            return
+        # Сессии старого формата хранили полные снимки в deque history
+        snapshots = [self._freeze(snapshot) for snapshot in state.get('history', ())]
+        self.max_history = getattr(state.get('history'), 'maxlen', None) or 50
+        self.__dict__.pop('history', None)
+        self.patches = [self._make_patch(a, b) for a, b in zip(snapshots, snapshots[1:])]
+        index = state.get('current_index', -1)
+        self.current_state = snapshots[index] if 0 <= index < len(snapshots) else None
+        if self.current_state is None:
+            self.current_index = -1
+
+    @staticmethod
+    def _freeze(state):
+        """Снимок состояния для хранения в истории.
+
+        Фразы — неизменяемые кортежи (phrase, freq), поэтому списки достаточно
+        превратить в кортежи: снимки разделяют элементы без глубокого копирования.
+        Словари (снимки папок) обходятся рекурсивно.
+        """
+        if isinstance(state, list):
+            return tuple(state)
+        if isinstance(state, dict):
+            return {key: HistoryManager._freeze(value) for key, value in state.items()}
+        return state
+
+    @staticmethod
+    def _thaw(state):
+        """Изменяемая копия снимка для восстановления состояния"""
+        if isinstance(state, tuple):
+            return list(state)
+        if isinstance(state, dict):
+            return {key: HistoryManager._thaw(value) for key, value in state.items()}
+        if isinstance(state, list):
+            # Снимки из старых сессий хранились списками
+            return list(state)
+        return state
+
+    @staticmethod
+    def _common_prefix(a: tuple, b: tuple) -> int:
+        limit = min(len(a), len(b))
+        block = HistoryManager.PREFIX_BLOCK
+        i = 0
+        while i + block <= limit and a[i:i + block] == b[i:i + block]:
+            i += block
+        while i < limit and a[i] == b[i]:
+            i += 1
+        return i
+
+    @staticmethod
+    def _common_suffix(a: tuple, b: tuple, limit: int) -> int:
+        """Длина общего окончания, не больше limit"""
+        len_a, len_b = len(a), len(b)
+        block = HistoryManager.PREFIX_BLOCK
+        i = 0
+        while i + block <= limit and a[len_a - i - block:len_a - i] == b[len_b - i - block:len_b - i]:
+            i += block
+        while i < limit and a[len_a - i - 1] == b[len_b - i - 1]:
+            i += 1
+        return i
+
+    @staticmethod
+    def _make_patch(before, after) -> Tuple:
+        """Патч (начало, старый фрагмент, новый фрагмент); для не-кортежей — оба состояния целиком"""
+        if not (isinstance(before, tuple) and isinstance(after, tuple)):
+            return None, before, after
+        prefix = HistoryManager._common_prefix(before, after)
+        # Суффикс не заходит в уже совпавший префикс
+        suffix = HistoryManager._common_suffix(before, after, min(len(before), len(after)) - prefix)
+        return prefix, before[prefix:len(before) - suffix], after[prefix:len(after) - suffix]
+
+    @staticmethod
+    def _apply_patch(state, start, old, new):
+        """Замена фрагмента old на new, начиная с позиции start"""
+        if start is None:
+            return new
+        return state[:start] + new + state[start + len(old):]
+
     def set_initial_state(self, state: List[Tuple[str, int]]):
         """Установка начального состояния"""
-        self.initial_state = copy.deepcopy(state)
-        self.history.clear()
-        self.history.append(copy.deepcopy(state))
+        self.initial_state = self._freeze(state)
+        self.current_state = self.initial_state
+        self.patches = []
         self.current_index = 0
 
     def add_state(self, state: List[Tuple[str, int]]):
         """Добавление нового состояния"""
-        state_copy = copy.deepcopy(state)
+        state_copy = self._freeze(state)
 
         # Не дублируем одинаковые соседние состояния
-        if self.current_index >= 0 and self.history and self.history[self.current_index] == state_copy:
+        if self.current_index >= 0 and self.current_state == state_copy:
+            return
+
+        if self.current_index < 0:
+            self.set_initial_state(state)
             return
 
-        while len(self.history) > self.current_index + 1:
-            self.history.pop()
+        del self.patches[self.current_index:]
+        self.patches.append(self._make_patch(self.current_state, state_copy))
+        self.current_state = state_copy
+        self.current_index = len(self.patches)
 
-        self.history.append(state_copy)
-        self.current_index = len(self.history) - 1
+        # Самые старые состояния отбрасываются, как в deque(maxlen=max_history)
+        while len(self.patches) >= self.max_history:
+            self.patches.pop(0)
+            self.current_index -= 1
 
     def undo(self) -> Optional[List[Tuple[str, int]]]:
         """Отмена последнего действия"""
         if self.current_index > 0:
             self.current_index -= 1
-            return copy.deepcopy(self.history[self.current_index])
+            start, old, new = self.patches[self.current_index]
+            self.current_state = self._apply_patch(self.current_state, start, new, old)
+            return self._thaw(self.current_state)
         return None
 
     def redo(self) -> Optional[List[Tuple[str, int]]]:
         """Повтор отмененного действия"""
-        if self.current_index < len(self.history) - 1:
+        if 0 <= self.current_index < len(self.patches):
+            start, old, new = self.patches[self.current_index]
+            self.current_state = self._apply_patch(self.current_state, start, old, new)
             self.current_index += 1
-            return copy.deepcopy(self.history[self.current_index])
+            return self._thaw(self.current_state)
         return None
 
     def can_undo(self) -> bool:
@@ -649,7 +817,7 @@ class HistoryManager:
 
     def can_redo(self) -> bool:
         """Можно ли повторить"""
-        return self.current_index < len(self.history) - 1
+        return 0 <= self.current_index < len(self.patches)
 
 
 @dataclass
@@ -665,17 +833,19 @@ class PhraseList:
 class PhraseProcessor:
     """Бизнес-логика обработки фраз"""
 
+    SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s]')
+
     @staticmethod
     def remove_duplicates(phrases: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
         """Удаление точных дубликатов с сохранением порядка"""
-        seen = set()
-        result = []
+        # Словарь сохраняет порядок вставки: первая встреченная фраза остается
+        unique = {}
         for phrase, freq in phrases:
-            phrase_lower = phrase.lower().strip()
-            if phrase_lower not in seen:
-                seen.add(phrase_lower)
-                result.append((phrase.strip(), freq))
-        return result
+            stripped = phrase.strip()
+            key = stripped.lower()
+            if key not in unique:
+                unique[key] = (stripped, freq)
+        return list(unique.values())
 
     @staticmethod
     def sort_phrases_alphabetically(phrases: List[Tuple[str, int]], reverse: bool = False) -> List[Tuple[str, int]]:
@@ -685,132 +855,117 @@ class PhraseProcessor:
     @staticmethod
     def sort_phrases_by_frequency(phrases: List[Tuple[str, int]], reverse: bool = True) -> List[Tuple[str, int]]:
         """Сортировка фраз по частотности"""
-        return sorted(phrases, key=lambda x: x[1], reverse=reverse)
+        return sorted(phrases, key=itemgetter(1), reverse=reverse)
+
+    RU_TO_EN = {
+        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd',
+        'е': 'e', 'ё': 'yo', 'ж': 'zh', 'з': 'z', 'и': 'i',
+        'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+        'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
+        'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
+        'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': "'",
+        'э': 'e', 'ю': 'yu', 'я': 'ya',
+    }
+    # Таблица для str.translate: строчные как есть, заглавные с заглавной первой буквой (Ж -> Zh)
+    RU_TO_EN_TABLE = str.maketrans({
+        **RU_TO_EN,
+        **dict(zip(map(str.upper, RU_TO_EN), map(str.capitalize, RU_TO_EN.values()))),
+    })
+
+    EN_TO_RU_MULTI = {
+        'shch': 'щ',
+        'yo': 'ё',
+        'zh': 'ж',
+        'kh': 'х',
+        'ts': 'ц',
+        'ch': 'ч',
+        'sh': 'ш',
+        'yu': 'ю',
+        'ya': 'я',
+        'ju': 'ю',
+        'ja': 'я',
+        'jo': 'ё',
+    }
+    EN_TO_RU_SINGLE = {
+        'a': 'а', 'b': 'б', 'v': 'в', 'w': 'в', 'g': 'г',
+        'd': 'д', 'e': 'е', 'z': 'з', 'i': 'и', 'y': 'й',
+        'j': 'й', 'k': 'к', 'l': 'л', 'm': 'м', 'n': 'н',
+        'o': 'о', 'p': 'п', 'r': 'р', 's': 'с', 't': 'т',
+        'u': 'у', 'f': 'ф', 'h': 'х', 'c': 'к', 'q': 'к',
+        'x': 'кс', "'": 'ь', '`': 'ь',
+    }
+    # Сначала длинные комбинации, затем одиночные буквы
+    EN_TO_RU_PATTERN = re.compile(
+        '|'.join(sorted(EN_TO_RU_MULTI, key=len, reverse=True))
+        + '|[' + re.escape(''.join(EN_TO_RU_SINGLE)) + ']',
+        re.IGNORECASE | re.ASCII
+    )
 
     @staticmethod
     def transliterate_phrases(phrases: List[Tuple[str, int]], reverse: bool = False) -> List[Tuple[str, int]]:
         """Транслитерация фраз (reverse=False: RU->EN, reverse=True: EN->RU)"""
+        transliterate_token = PhraseProcessor._transliterate_token
         result = []
         for phrase, freq in phrases:
+            # В таблице RU->EN только кириллица: латинские фразы не меняются
+            if not reverse and phrase.isascii():
+                result.append((phrase, freq))
+                continue
             try:
-                if reverse:
-                    converted = PhraseProcessor._transliterate_en_to_ru(phrase)
-                else:
-                    converted = PhraseProcessor._transliterate_ru_to_en(phrase)
+                # Правила не переходят через пробел, поэтому слова кешируются по отдельности
+                converted = ' '.join([transliterate_token(token, reverse) for token in phrase.split(' ')])
                 result.append((converted, freq))
             except Exception:
                 result.append((phrase, freq))
         return result
 
     @staticmethod
-    def _transliterate_ru_to_en(text: str) -> str:
-        ru_to_en = {
-            'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd',
-            'е': 'e', 'ё': 'yo', 'ж': 'zh', 'з': 'z', 'и': 'i',
-            'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
-            'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't',
-            'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch',
-            'ш': 'sh', 'щ': 'shch', 'ъ': '', 'ы': 'y', 'ь': "'",
-            'э': 'e', 'ю': 'yu', 'я': 'ya',
-        }
+    @lru_cache(maxsize=200000)
+    def _transliterate_token(token: str, reverse: bool) -> str:
+        if reverse:
+            return PhraseProcessor._transliterate_en_to_ru(token)
+        return PhraseProcessor._transliterate_ru_to_en(token)
 
-        out = []
-        for ch in text:
-            low = ch.lower()
-            if low not in ru_to_en:
-                out.append(ch)
-                continue
-
-            tr = ru_to_en[low]
-            if ch.isupper():
-                if len(tr) > 1:
-                    tr = tr[0].upper() + tr[1:]
-                else:
-                    tr = tr.upper()
-            out.append(tr)
-        return ''.join(out)
+    @staticmethod
+    def _transliterate_ru_to_en(text: str) -> str:
+        return text.translate(PhraseProcessor.RU_TO_EN_TABLE)
 
     @staticmethod
     def _transliterate_en_to_ru(text: str) -> str:
-        # Сначала длинные комбинации, затем одиночные буквы
-        multi = {
-            'shch': 'щ',
-            'yo': 'ё',
-            'zh': 'ж',
-            'kh': 'х',
-            'ts': 'ц',
-            'ch': 'ч',
-            'sh': 'ш',
-            'yu': 'ю',
-            'ya': 'я',
-            'ju': 'ю',
-            'ja': 'я',
-            'jo': 'ё',
-        }
-        single = {
-            'a': 'а', 'b': 'б', 'v': 'в', 'w': 'в', 'g': 'г',
-            'd': 'д', 'e': 'е', 'z': 'з', 'i': 'и', 'y': 'й',
-            'j': 'й', 'k': 'к', 'l': 'л', 'm': 'м', 'n': 'н',
-            'o': 'о', 'p': 'п', 'r': 'р', 's': 'с', 't': 'т',
-            'u': 'у', 'f': 'ф', 'h': 'х', 'c': 'к', 'q': 'к',
-            'x': 'кс', "'": 'ь', '`': 'ь',
-        }
-
-        keys = sorted(multi.keys(), key=len, reverse=True)
-        out = []
-        i = 0
-        while i < len(text):
-            matched = False
-            for key in keys:
-                token = text[i:i + len(key)]
-                if token.lower() != key:
-                    continue
-
-                ru = multi[key]
-                if token.isupper() or token[:1].isupper():
-                    ru = ru.upper()
-                out.append(ru)
-                i += len(key)
-                matched = True
-                break
-
-            if matched:
-                continue
-
-            ch = text[i]
-            low = ch.lower()
-            if low in single:
-                ru = single[low]
-                if ch.isupper():
-                    ru = ru.upper()
-                out.append(ru)
-            else:
-                out.append(ch)
-            i += 1
-
+        converted = PhraseProcessor.EN_TO_RU_PATTERN.sub(PhraseProcessor._en_to_ru_token, text)
         # В обычном тексте мягкий знак должен быть строчным
-        return ''.join(out).replace('Ь', 'ь')
+        return converted.replace('Ь', 'ь')
+
+    @staticmethod
+    def _en_to_ru_token(match) -> str:
+        token = match.group()
+        low = token.lower()
+        ru = PhraseProcessor.EN_TO_RU_MULTI.get(low) or PhraseProcessor.EN_TO_RU_SINGLE[low]
+        return ru.upper() if token[0].isupper() else ru
 
     @staticmethod
-    def filter_by_stop_words(phrases: List[Tuple[str, int]], stop_words: Set[str]) -> List[Tuple[str, int]]:
+    def filter_by_stop_words(phrases: Iterable[Tuple[str, int]], stop_words: Set[str]) -> List[Tuple[str, int]]:
         """Фильтрация по стоп-словам"""
         if not stop_words:
-            return phrases
+            return phrases if isinstance(phrases, list) else list(phrases)
 
-        result = []
-        for phrase, freq in phrases:
-            phrase_lower = phrase.lower()
-            if not any(stop.lower() in phrase_lower for stop in stop_words):
-                result.append((phrase, freq))
-        return result
+        search = PhraseProcessor._compile_stop_words_pattern(frozenset(stop_words)).search
+        return [(phrase, freq) for phrase, freq in phrases if not search(phrase.lower())]
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _compile_stop_words_pattern(stop_words: frozenset) -> re.Pattern:
+        """Одно объединение литералов вместо перебора стоп-слов для каждой фразы"""
+        return re.compile('|'.join(map(re.escape, sorted({stop.lower() for stop in stop_words}))))
 
     @staticmethod
     def remove_special_chars(phrases: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
         """Удаление спецсимволов и лишних пробелов"""
+        sub = PhraseProcessor.SPECIAL_CHARS_PATTERN.sub
         result = []
         for phrase, freq in phrases:
-            cleaned = re.sub(r'[^\w\s]', ' ', phrase)
-            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+            # split/join схлопывает пробелы и обрезает края за один проход
+            cleaned = ' '.join(sub(' ', phrase).split())
             if cleaned:
                 result.append((cleaned, freq))
         return result
@@ -818,22 +973,17 @@ class PhraseProcessor:
     @staticmethod
     def convert_case(phrases: List[Tuple[str, int]], to_upper: bool) -> List[Tuple[str, int]]:
         """Преобразование регистра"""
-        result = []
-        for phrase, freq in phrases:
-            if to_upper:
-                result.append((phrase.upper(), freq))
-            else:
-                result.append((phrase.lower(), freq))
-        return result
+        convert = str.upper if to_upper else str.lower
+        return [(convert(phrase), freq) for phrase, freq in phrases]
 
     @staticmethod
     def remove_long_phrases(phrases: List[Tuple[str, int]], max_words: int = 7) -> List[Tuple[str, int]]:
         """Удаление фраз длиннее указанного количества слов"""
-        result = []
-        for phrase, freq in phrases:
-            if len(phrase.split()) <= max_words:
-                result.append((phrase, freq))
-        return result
+        # maxsplit: длинную фразу не нужно разбивать целиком
+        return [
+            (phrase, freq) for phrase, freq in phrases
+            if len(phrase.split(None, max_words)) <= max_words
+        ]
 
     @staticmethod
     def group_phrases(phrases: List[Tuple[str, int]]) -> Dict[str, List[Tuple[str, int]]]:
@@ -841,21 +991,70 @@ class PhraseProcessor:
         groups = defaultdict(list)
 
         for phrase, freq in phrases:
-            words = phrase.lower().split()
-            word_freq = defaultdict(int)
-            for word in words:
-                if len(word) > 3:
-                    word_freq[word] += 1
-
-            if word_freq:
-                main_word = max(word_freq.keys(), key=len)
-                groups[main_word].append((phrase, freq))
-            else:
-                groups['другое'].append((phrase, freq))
+            # Самое длинное слово длиннее 3 символов, при равенстве — первое встретившееся
+            main_word = 'другое'
+            main_len = 3
+            for word in phrase.lower().split():
+                if len(word) > main_len:
+                    main_word = word
+                    main_len = len(word)
+            groups[main_word].append((phrase, freq))
 
         return dict(groups)
 
 
+class ExcelExporter:
+    """Потоковая запись Excel-файлов (openpyxl write-only, без DataFrame в памяти)"""
+
+    SHEET_NAME_LIMIT = 31
+    INVALID_SHEET_CHARS = re.compile(r'[\\/*?:\[\]]')
+
+    @staticmethod
+    def unique_sheet_names(names: List[str]) -> List[str]:
+        """Допустимые и неповторяющиеся названия листов (Excel: до 31 символа, без учета регистра)"""
+        limit = ExcelExporter.SHEET_NAME_LIMIT
+        used = set()
+        result = []
+        for name in names:
+            base = ExcelExporter.INVALID_SHEET_CHARS.sub('_', name)[:limit] or "Лист"
+            candidate = base
+            n = 1
+            while candidate.lower() in used:
+                suffix = f"_{n}"
+                candidate = base[:limit - len(suffix)] + suffix
+                n += 1
+            used.add(candidate.lower())
+            result.append(candidate)
+        return result
+
+    @staticmethod
+    def write_sheets(file_path: str, sheets: Iterable[Tuple[str, List[str], Iterable[Tuple]]]):
+        """Запись листов (название, заголовки, строки) построчно; строки могут быть генератором"""
+        # openpyxl загружается при первом экспорте, а не при запуске приложения
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, Side
+
+        header_font = Font(bold=True)
+        header_alignment = Alignment(horizontal="center", vertical="top")
+        header_border = Border(*(Side(style="thin"),) * 4)
+
+        workbook = Workbook(write_only=True)
+        for sheet_name, header, rows in sheets:
+            worksheet = workbook.create_sheet(title=sheet_name)
+            header_cells = []
+            for title in header:
+                cell = WriteOnlyCell(worksheet, value=title)
+                cell.font = header_font
+                cell.alignment = header_alignment
+                cell.border = header_border
+                header_cells.append(cell)
+            worksheet.append(header_cells)
+            for row in rows:
+                worksheet.append(row)
+        workbook.save(file_path)
+
+
 class ModernButton(QPushButton):
     """Современная кнопка в стиле macOS"""
 
@@ -962,8 +1161,14 @@ class SearchWidget(QWidget):
 
     search_changed = pyqtSignal(str, bool, bool)
 
+    SEARCH_DELAY_MS = 150  # пауза после ввода перед фильтрацией
+
     def __init__(self):
         super().__init__()
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.on_search_changed)
         self.setup_ui()
         self.apply_theme("light")
 
@@ -983,7 +1188,8 @@ class SearchWidget(QWidget):
         self.search_input.setPlaceholderText("Поиск по фразам...")
         self.search_input.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         self.search_input.setMinimumHeight(22)
-        self.search_input.textChanged.connect(self.on_search_changed)
+        # Ввод откладывается, чтобы не фильтровать таблицу на каждый символ
+        self.search_input.textChanged.connect(self.on_text_changed)
         search_layout.addWidget(self.search_input)
 
         self.search_container.setLayout(search_layout)
@@ -1139,6 +1345,13 @@ class SearchWidget(QWidget):
             }}
         """)
 
+    def on_text_changed(self, _text: str):
+        # До отложенного поиска счетчик и навигация относились бы к прежнему запросу
+        self.prev_btn.setEnabled(False)
+        self.next_btn.setEnabled(False)
+        self.result_label.hide()
+        self.search_timer.start()
+
     def on_search_changed(self):
         text = self.search_input.text()
         self.search_changed.emit(text, self.only_matches.isChecked(), self.exact_search.isChecked())
@@ -1148,6 +1361,7 @@ class SearchWidget(QWidget):
         self.next_btn.setEnabled(has_text)
 
     def on_filter_changed(self):
+        self.search_timer.stop()
         self.on_search_changed()
 
     def update_results(self, current: int, total: int):
@@ -1158,26 +1372,142 @@ class SearchWidget(QWidget):
             self.result_label.hide()
 
 
-class FrequencyTableWidgetItem(QTableWidgetItem):
-    """Кастомный элемент таблицы для правильной сортировки частотности"""
+class PhraseTableModel(QAbstractTableModel):
+    """Модель отображаемых строк таблицы фраз: (индекс в current_data, фраза, частотность)"""
+
+    HEADERS = ["", "Фраза", "Частотность"]
+    # Границы уровней частотности; уровень строки = bisect_right(FREQUENCY_THRESHOLDS, freq)
+    FREQUENCY_THRESHOLDS = (100, 1000, 10000, 100000)
+
+    check_toggled = pyqtSignal(int, bool)  # row, checked
+    cell_edited = pyqtSignal(int, int, object)  # row, column, value
+
+    def __init__(self, table):
+        super().__init__(table)
+        self.table = table
+        self.rows: List[Tuple[int, str, int]] = []
+        self._brush_cache: Dict[str, Tuple[Tuple[QBrush, ...], Tuple[QBrush, ...], QBrush]] = {}
+
+    def _brushes(self) -> Tuple[Tuple[QBrush, ...], Tuple[QBrush, ...], QBrush]:
+        """Кисти фона, цвета частотности и текста для текущей темы (создаются один раз на тему)"""
+        theme = self.table.current_theme
+        brushes = self._brush_cache.get(theme)
+        if brushes is None:
+            palette = "dark" if theme == "dark" else "light"
+            brushes = (
+                tuple(QBrush(QColor(*rgb)) for rgb in self.table.FREQUENCY_BG_COLORS[palette]),
+                tuple(QBrush(QColor(*rgb)) for rgb in self.table.FREQUENCY_TEXT_COLORS[palette]),
+                QBrush(QColor(242, 242, 247) if theme == "dark" else QColor(0, 0, 0)),
+            )
+            self._brush_cache[theme] = brushes
+        return brushes
+
+    def set_rows(self, rows: List[Tuple[int, str, int]]):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
 
-    def __init__(self, value: int):
-        super().__init__(str(value))
-        self.value = value
+    def refresh(self):
+        """Перерисовка всех ячеек без пересоздания строк"""
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, len(self.HEADERS) - 1))
 
-    def __lt__(self, other):
-        if isinstance(other, FrequencyTableWidgetItem):
-            return self.value < other.value
-        return super().__lt__(other)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
 
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
 
-class CheckboxTableWidgetItem(QTableWidgetItem):
-    """Кастомный элемент для правильной сортировки чекбоксов"""
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
 
-    def __lt__(self, other):
-        if isinstance(other, CheckboxTableWidgetItem):
-            return self.checkState() < other.checkState()
-        return super().__lt__(other)
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        source_index, phrase, freq = self.rows[index.row()]
+        column = index.column()
+
+        if column == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if (phrase, freq) in self.table.checked_keys else Qt.Unchecked
+            return None
+
+        if role == Qt.UserRole:
+            return source_index
+
+        if column == 1:
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return phrase
+            if role == Qt.BackgroundRole:
+                return self._brushes()[0][bisect_right(self.FREQUENCY_THRESHOLDS, freq)]
+            if role == Qt.ForegroundRole:
+                return self._brushes()[2]
+            return None
+
+        if role == Qt.DisplayRole:
+            return str(freq)
+        if role == Qt.EditRole:
+            return freq
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole:
+            return self._brushes()[1][bisect_right(self.FREQUENCY_THRESHOLDS, freq)]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+
+        if index.column() == 0:
+            if role != Qt.CheckStateRole:
+                return False
+            self.check_toggled.emit(index.row(), value == Qt.Checked)
+            self.dataChanged.emit(index, index)
+            return True
+
+        if role != Qt.EditRole:
+            return False
+        self.cell_edited.emit(index.row(), index.column(), value)
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Стабильная сортировка отображаемых строк"""
+        # Ключи считаются одним проходом, сортировка индексов идет без lambda на строку
+        if column == 0:
+            checked = self.table.checked_keys
+            keys = [(row[1], row[2]) in checked for row in self.rows]
+        elif column == 1:
+            # Без учета регистра, как и сортировка по алфавиту из меню
+            keys = [row[1].lower() for row in self.rows]
+        elif column == 2:
+            keys = [row[2] for row in self.rows]
+        else:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        permutation = sorted(range(len(self.rows)), key=keys.__getitem__, reverse=(order == Qt.DescendingOrder))
+        new_positions = [0] * len(permutation)
+        for new_row, old_row in enumerate(permutation):
+            new_positions[old_row] = new_row
+        self.rows = [self.rows[i] for i in permutation]
+
+        old_indexes = self.persistentIndexList()
+        new_indexes = [
+            self.index(new_positions[idx.row()], idx.column()) if idx.isValid() else idx
+            for idx in old_indexes
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
 
 
 class CheckboxItemDelegate(QStyledItemDelegate):
@@ -1239,13 +1569,30 @@ class CheckboxItemDelegate(QStyledItemDelegate):
 class SearchHighlightDelegate(QStyledItemDelegate):
     """Подсветка совпадений поискового запроса в колонке фраз"""
 
+    # Цвета создаются один раз, а не при отрисовке каждой ячейки: (текст, заливка, рамка)
+    THEME_COLORS = {
+        "light": (QColor(0, 0, 0), QColor(255, 236, 153), QColor(186, 140, 0)),
+        "dark": (QColor(242, 242, 247), QColor(101, 83, 0, 190), QColor(255, 204, 0)),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._exact_pattern_query = None
+        self._exact_pattern = None
+
+    def _exact_pattern_for(self, query: str) -> re.Pattern:
+        if query != self._exact_pattern_query:
+            self._exact_pattern = re.compile(r'\b' + re.escape(query) + r'\b', re.IGNORECASE)
+            self._exact_pattern_query = query
+        return self._exact_pattern
+
     def _find_matches(self, text: str, query: str, exact: bool) -> List[Tuple[int, int]]:
         if not text or not query:
             return []
 
         matches = []
         if exact:
-            pattern = re.compile(r'\b' + re.escape(query) + r'\b', re.IGNORECASE)
+            pattern = self._exact_pattern_for(query)
             for m in pattern.finditer(text):
                 matches.append((m.start(), m.end()))
             return matches
@@ -1297,7 +1644,7 @@ class SearchHighlightDelegate(QStyledItemDelegate):
         painter.setClipRect(text_rect)
 
         is_dark = getattr(table, "current_theme", "light") == "dark"
-        normal_color = QColor(242, 242, 247) if is_dark else QColor(0, 0, 0)
+        normal_color, highlight_fill, highlight_border = self.THEME_COLORS["dark" if is_dark else "light"]
         painter.setPen(normal_color)
 
         if not matches:
@@ -1316,8 +1663,6 @@ class SearchHighlightDelegate(QStyledItemDelegate):
             matched_part = text[start:end]
             w = fm.horizontalAdvance(matched_part)
             hrect = QRect(x - 1, baseline - fm.ascent() - 1, w + 2, fm.height() + 2)
-            highlight_fill = QColor(101, 83, 0, 190) if is_dark else QColor(255, 236, 153)
-            highlight_border = QColor(255, 204, 0) if is_dark else QColor(186, 140, 0)
             painter.fillRect(hrect, highlight_fill)
             painter.setPen(highlight_border)
             painter.drawRect(hrect)
@@ -1557,13 +1902,85 @@ class DuplicateConfirmDialog(QDialog):
         self.setLayout(layout)
 
 
-class MainPhraseTable(QTableWidget):
+class MainPhraseTable(QTableView):
     """Современная таблица с фразами в стиле macOS"""
 
     phrases_to_folder = pyqtSignal(str, list, bool, bool)  # folder_name, list of (phrase, freq), is_global, is_move
     table_view_changed = pyqtSignal()   # изменился отображаемый вид (фильтр/поиск)
     table_data_changed = pyqtSignal()   # изменились данные фраз
 
+    # Цвета по уровням частотности (< 100, 100+, 1000+, 10000+, 100000+)
+    FREQUENCY_BG_COLORS = {
+        "light": ((255, 255, 255), (243, 255, 243), (255, 250, 235), (255, 243, 235), (255, 235, 235)),
+        "dark": ((28, 28, 30), (24, 62, 30), (64, 56, 20), (66, 44, 20), (62, 24, 26)),
+    }
+    FREQUENCY_TEXT_COLORS = {
+        "light": ((142, 142, 147), (52, 199, 36), (255, 204, 0), (255, 149, 0), (255, 59, 48)),
+        "dark": ((174, 174, 178), (48, 209, 88), (255, 214, 10), (255, 159, 10), (255, 69, 58)),
+    }
+    # Кисти частотности для деревьев групп, кластеров и папок (общие для всех элементов)
+    TREE_FREQUENCY_BRUSHES = tuple(QBrush(QColor(*rgb)) for rgb in FREQUENCY_TEXT_COLORS["light"])
+    CONTEXT_MENU_STYLES = {
+        "dark": """
+            QMenu {
+                background-color: #2c2c2e;
+                color: #f2f2f7;
+                border: 1px solid #4b4b50;
+                border-radius: 8px;
+                padding: 5px;
+                font-family: Arial;
+                font-size: 13px;
+            }
+            QMenu::item {
+                padding: 6px 20px;
+                border-radius: 4px;
+            }
+            QMenu::item:selected {
+                background-color: #3a3a3c;
+            }
+            QMenu::separator {
+                height: 1px;
+                background: #4b4b50;
+                margin: 5px 0;
+            }
+        """,
+        "light": """
+            QMenu {
+                background-color: #ffffff;
+                color: #000000;
+                border: 1px solid #c7c7cc;
+                border-radius: 8px;
+                padding: 5px;
+                font-family: Arial;
+                font-size: 13px;
+            }
+            QMenu::item {
+                padding: 6px 20px;
+                border-radius: 4px;
+            }
+            QMenu::item:selected {
+                background-color: #e5e5ea;
+            }
+            QMenu::separator {
+                height: 1px;
+                background: #e5e5ea;
+                margin: 5px 0;
+            }
+        """,
+    }
+
+    # (заголовок, по галочкам, общая папка, перемещение)
+    FOLDER_MENU_ITEMS = (
+        ("Копировать выбранные (галочки) в папку", True, False, False),
+        ("Переместить выбранные (галочки) в папку", True, False, True),
+        ("Копировать выделенные в папку", False, False, False),
+        ("Переместить выделенные в папку", False, False, True),
+        ("Копировать выбранные (галочки) в общую папку", True, True, False),
+        ("Переместить выбранные (галочки) в общую папку", True, True, True),
+        ("Копировать выделенные в общую папку", False, True, False),
+        ("Переместить выделенные в общую папку", False, True, True),
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.processor = PhraseProcessor()
@@ -1571,14 +1988,19 @@ class MainPhraseTable(QTableWidget):
         self.stop_words = set()
         self.original_data = []
         self.current_data = []
+        self._lower_source = None  # список current_data, для которого посчитан _lower_phrases
+        self._lower_phrases = []
+        self._matching_key = None  # (строки модели, current_data, запрос, точный поиск) для _matching_rows
+        self._matching_rows = []
         self.search_text = ""
         self.search_only_matches = False
         self.exact_search = False
+        self._search_lower = ""
+        self._exact_search_pattern = None
         self.current_search_index = 0
         self.folders = {}  # local folders
         self.global_folders = {}  # global folders
         self.checked_keys = set()  # сохранение отмеченных чекбоксов между фильтрами/поиском
-        self._syncing_checkboxes = False
         self.checkbox_header = None
         self.checkbox_delegate = None
         self.search_delegate = None
@@ -1586,8 +2008,11 @@ class MainPhraseTable(QTableWidget):
         self.current_theme = "light"
         self.default_sort_column = 2
         self.default_sort_order = Qt.DescendingOrder
+        self.phrase_model = PhraseTableModel(self)
+        self.phrase_model.check_toggled.connect(self.on_check_toggled)
+        self.phrase_model.cell_edited.connect(self.on_cell_edited)
+        self.setModel(self.phrase_model)
         self.setup_ui()
-        self.itemChanged.connect(self.on_item_changed)
 
     def setup_ui(self):
         """Настройка дизайна таблицы в стиле macOS"""
@@ -1602,9 +2027,6 @@ class MainPhraseTable(QTableWidget):
         self.setItemDelegateForColumn(1, self.search_delegate)
         self.setItemDelegateForColumn(2, self.frequency_delegate)
 
-        self.setColumnCount(3)
-        self.setHorizontalHeaderLabels(["", "Фраза", "Частотность"])
-
         self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
         self.setColumnWidth(0, 40)
         self.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
@@ -1616,7 +2038,7 @@ class MainPhraseTable(QTableWidget):
         self.horizontalHeader().setSortIndicator(self.default_sort_column, self.default_sort_order)
 
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;
                 color: #000000;
                 gridline-color: #e5e5ea;
@@ -1625,15 +2047,15 @@ class MainPhraseTable(QTableWidget):
                 font-family: Arial;
                 font-size: 13px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
                 border-bottom: 1px solid #f2f2f7;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e5e5ea;
                 color: #000000;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #f2f2f7;
             }
             QHeaderView::section {
@@ -1662,13 +2084,15 @@ class MainPhraseTable(QTableWidget):
         self.setAlternatingRowColors(False)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.verticalHeader().setVisible(False)
+        # Одинаковая высота строк: вид не опрашивает sizeHint каждой строки модели
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.apply_theme("light")
 
     def apply_theme(self, theme: str):
         self.current_theme = "dark" if theme == "dark" else "light"
         if theme == "dark":
             self.setStyleSheet("""
-                QTableWidget {
+                QTableView {
                     background-color: #1c1c1e;
                     color: #f2f2f7;
                     gridline-color: #3a3a3c;
@@ -1677,15 +2101,15 @@ class MainPhraseTable(QTableWidget):
                     font-family: Arial;
                     font-size: 13px;
                 }
-                QTableWidget::item {
+                QTableView::item {
                     padding: 6px;
                     border-bottom: 1px solid #2c2c2e;
                 }
-                QTableWidget::item:selected {
+                QTableView::item:selected {
                     background-color: #3a3a3c;
                     color: #ffffff;
                 }
-                QTableWidget::item:hover {
+                QTableView::item:hover {
                     background-color: #2b2b30;
                 }
                 QHeaderView::section {
@@ -1714,7 +2138,7 @@ class MainPhraseTable(QTableWidget):
             return
 
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #ffffff;
                 color: #000000;
                 gridline-color: #e5e5ea;
@@ -1723,15 +2147,15 @@ class MainPhraseTable(QTableWidget):
                 font-family: Arial;
                 font-size: 13px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
                 border-bottom: 1px solid #f2f2f7;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e5e5ea;
                 color: #000000;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #f2f2f7;
             }
             QHeaderView::section {
@@ -1759,40 +2183,21 @@ class MainPhraseTable(QTableWidget):
         self.refresh_theme_visuals()
 
     def get_frequency_text_color(self, freq: int) -> QColor:
-        is_dark = self.current_theme == "dark"
-        if freq >= 100000:
-            return QColor(255, 69, 58) if is_dark else QColor(255, 59, 48)
-        if freq >= 10000:
-            return QColor(255, 159, 10) if is_dark else QColor(255, 149, 0)
-        if freq >= 1000:
-            return QColor(255, 214, 10) if is_dark else QColor(255, 204, 0)
-        if freq >= 100:
-            return QColor(48, 209, 88) if is_dark else QColor(52, 199, 36)
-        return QColor(174, 174, 178) if is_dark else QColor(142, 142, 147)
-
-    def refresh_theme_visuals(self):
-        phrase_fg = QBrush(QColor(242, 242, 247) if self.current_theme == "dark" else QColor(0, 0, 0))
-        for row in range(self.rowCount()):
-            phrase_item = self.item(row, 1)
-            freq_item = self.item(row, 2)
-            if not phrase_item or not freq_item:
-                continue
+        theme = "dark" if self.current_theme == "dark" else "light"
+        return QColor(*self.FREQUENCY_TEXT_COLORS[theme][self.frequency_tier(freq)])
 
-            try:
-                freq = int(freq_item.text())
-            except Exception:
-                freq = 0
+    @staticmethod
+    def frequency_tier(freq: int) -> int:
+        """Уровень частотности 0..4 по границам PhraseTableModel.FREQUENCY_THRESHOLDS"""
+        return bisect_right(PhraseTableModel.FREQUENCY_THRESHOLDS, freq)
 
-            phrase_item.setBackground(QBrush(self.get_frequency_color(freq)))
-            if hasattr(phrase_item, "setForeground"):
-                phrase_item.setForeground(phrase_fg)
-            if hasattr(freq_item, "setForeground"):
-                freq_item.setForeground(QBrush(self.get_frequency_text_color(freq)))
+    def refresh_theme_visuals(self):
+        self.phrase_model.refresh()
 
     def _resolve_active_sort(self) -> Tuple[int, Qt.SortOrder]:
         header = self.horizontalHeader()
         section = header.sortIndicatorSection()
-        if section < 0 or section >= self.columnCount():
+        if section < 0 or section >= self.phrase_model.columnCount():
             section = self.default_sort_column
             order = self.default_sort_order
             header.setSortIndicator(section, order)
@@ -1801,108 +2206,40 @@ class MainPhraseTable(QTableWidget):
 
     def _apply_active_sort(self):
         section, order = self._resolve_active_sort()
-        self.sortItems(section, order)
+        self.phrase_model.sort(section, order)
+
+    def _populate_folder_submenu(self, submenu: QMenu, use_checked: bool, is_global: bool, is_move: bool):
+        """Заполнение подменю папок при первом открытии"""
+        if submenu.actions():
+            return
+        folders = self.global_folders if is_global else self.folders
+        for folder_name in folders.keys():
+            action = submenu.addAction(folder_name)
+            action.triggered.connect(
+                lambda checked, fn=folder_name: self.add_to_folder(fn, use_checked, is_global, is_move)
+            )
 
     def contextMenuEvent(self, event):
         """Создание контекстного меню в стиле macOS"""
         menu = QMenu(self)
-        if getattr(self, "current_theme", "light") == "dark":
-            menu.setStyleSheet("""
-                QMenu {
-                    background-color: #2c2c2e;
-                    color: #f2f2f7;
-                    border: 1px solid #4b4b50;
-                    border-radius: 8px;
-                    padding: 5px;
-                    font-family: Arial;
-                    font-size: 13px;
-                }
-                QMenu::item {
-                    padding: 6px 20px;
-                    border-radius: 4px;
-                }
-                QMenu::item:selected {
-                    background-color: #3a3a3c;
-                }
-                QMenu::separator {
-                    height: 1px;
-                    background: #4b4b50;
-                    margin: 5px 0;
-                }
-            """)
-        else:
-            menu.setStyleSheet("""
-                QMenu {
-                    background-color: #ffffff;
-                    color: #000000;
-                    border: 1px solid #c7c7cc;
-                    border-radius: 8px;
-                    padding: 5px;
-                    font-family: Arial;
-                    font-size: 13px;
-                }
-                QMenu::item {
-                    padding: 6px 20px;
-                    border-radius: 4px;
-                }
-                QMenu::item:selected {
-                    background-color: #e5e5ea;
-                }
-                QMenu::separator {
-                    height: 1px;
-                    background: #e5e5ea;
-                    margin: 5px 0;
-                }
-            """)
+        theme = "dark" if getattr(self, "current_theme", "light") == "dark" else "light"
+        menu.setStyleSheet(self.CONTEXT_MENU_STYLES[theme])
 
-        current_row = self.currentRow()
+        current_row = self.currentIndex().row()
 
         if current_row >= 0:
             delete_current = menu.addAction("Удалить эту фразу")
             delete_current.triggered.connect(lambda: self.delete_phrase(current_row))
             menu.addSeparator()
 
-        if self.folders:
-            local_copy_checked = menu.addMenu("Копировать выбранные (галочки) в папку")
-            for folder_name in self.folders.keys():
-                action = local_copy_checked.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, True, False, False))
-
-            local_move_checked = menu.addMenu("Переместить выбранные (галочки) в папку")
-            for folder_name in self.folders.keys():
-                action = local_move_checked.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, True, False, True))
-
-            local_copy_highlighted = menu.addMenu("Копировать выделенные в папку")
-            for folder_name in self.folders.keys():
-                action = local_copy_highlighted.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, False, False, False))
-
-            local_move_highlighted = menu.addMenu("Переместить выделенные в папку")
-            for folder_name in self.folders.keys():
-                action = local_move_highlighted.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, False, False, True))
-
-        if self.global_folders:
-            global_copy_checked = menu.addMenu("Копировать выбранные (галочки) в общую папку")
-            for folder_name in self.global_folders.keys():
-                action = global_copy_checked.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, True, True, False))
-
-            global_move_checked = menu.addMenu("Переместить выбранные (галочки) в общую папку")
-            for folder_name in self.global_folders.keys():
-                action = global_move_checked.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, True, True, True))
-
-            global_copy_highlighted = menu.addMenu("Копировать выделенные в общую папку")
-            for folder_name in self.global_folders.keys():
-                action = global_copy_highlighted.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, False, True, False))
-
-            global_move_highlighted = menu.addMenu("Переместить выделенные в общую папку")
-            for folder_name in self.global_folders.keys():
-                action = global_move_highlighted.addAction(folder_name)
-                action.triggered.connect(lambda checked, fn=folder_name: self.add_to_folder(fn, False, True, True))
+        # Подменю папок заполняются при первом открытии
+        for title, use_checked, is_global, is_move in self.FOLDER_MENU_ITEMS:
+            if not (self.global_folders if is_global else self.folders):
+                continue
+            submenu = menu.addMenu(title)
+            submenu.aboutToShow.connect(
+                lambda m=submenu, c=use_checked, g=is_global, mv=is_move: self._populate_folder_submenu(m, c, g, mv)
+            )
 
         menu.addSeparator()
 
@@ -1981,39 +2318,27 @@ class MainPhraseTable(QTableWidget):
     def add_to_folder(self, folder_name: str, use_checked: bool, is_global: bool, is_move: bool):
         selected_phrases = []
         if use_checked:
-            for row in range(self.rowCount()):
-                checkbox_item = self.item(row, 0)
-                if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                    phrase = self.item(row, 1).text()
-                    freq_item = self.item(row, 2)
-                    freq = 0
-                    if isinstance(freq_item, FrequencyTableWidgetItem):
-                        freq = freq_item.value
-                    elif freq_item:
-                        freq = int(freq_item.text()) if freq_item.text().isdigit() else 0
-                    selected_phrases.append((phrase, freq))
-                    checkbox_item.setCheckState(Qt.Unchecked)
+            selected_phrases = self.checked_row_keys()
+            if selected_phrases:
+                self.checked_keys.difference_update(selected_phrases)
+                self.phrase_model.refresh()
+                self.update_header_checkbox_state()
         else:
-            selected_rows = sorted(set(item.row() for item in self.selectedItems()), reverse=False)
-            for row in selected_rows:
-                phrase_item = self.item(row, 1)
-                if phrase_item:
-                    phrase = phrase_item.text()
-                    freq_item = self.item(row, 2)
-                    freq = 0
-                    if isinstance(freq_item, FrequencyTableWidgetItem):
-                        freq = freq_item.value
-                    elif freq_item:
-                        freq = int(freq_item.text()) if freq_item.text().isdigit() else 0
-                    selected_phrases.append((phrase, freq))
+            for row in self.selected_rows():
+                selected_phrases.append(self._row_key(row))
 
         if selected_phrases:
             self.phrases_to_folder.emit(folder_name, selected_phrases, is_global, is_move)
 
+    def selected_rows(self) -> List[int]:
+        selection_model = self.selectionModel()
+        if selection_model is None:
+            return []
+        return sorted(set(index.row() for index in selection_model.selectedIndexes()))
+
     def delete_phrase(self, visual_row: int):
-        phrase_item = self.item(visual_row, 1)
-        if phrase_item:
-            phrase_to_delete = phrase_item.text()
+        if 0 <= visual_row < self.phrase_model.rowCount():
+            phrase_to_delete = self._row_key(visual_row)[0]
             data = [
                 (p, f) for p, f in self.current_data
                 if p != phrase_to_delete
@@ -2027,35 +2352,16 @@ class MainPhraseTable(QTableWidget):
         self.set_all_checkboxes(False)
 
     def set_all_checkboxes(self, checked: bool):
-        sorting_was_enabled = False
-        if hasattr(self, "isSortingEnabled"):
-            try:
-                sorting_was_enabled = bool(self.isSortingEnabled())
-            except Exception:
-                sorting_was_enabled = False
-
-        if sorting_was_enabled and hasattr(self, "setSortingEnabled"):
-            self.setSortingEnabled(False)
-
-        self._syncing_checkboxes = True
-        try:
-            for row in range(self.rowCount()):
-                checkbox_item = self.item(row, 0)
-                if checkbox_item:
-                    checkbox_item.setCheckState(Qt.Checked if checked else Qt.Unchecked)
-                    key = self._row_key(row)
-                    if key is not None:
-                        if checked:
-                            self.checked_keys.add(key)
-                        else:
-                            self.checked_keys.discard(key)
-        finally:
-            self._syncing_checkboxes = False
-
-        if sorting_was_enabled and hasattr(self, "setSortingEnabled"):
-            self.setSortingEnabled(True)
-            if hasattr(self, "_apply_active_sort"):
-                self._apply_active_sort()
+        keys = [self._row_key(row) for row in range(self.phrase_model.rowCount())]
+        if checked:
+            self.checked_keys.update(keys)
+        else:
+            self.checked_keys.difference_update(keys)
+        self.phrase_model.refresh()
+        # Порядок строк зависит от отметок, только если сортировка идет по колонке чекбоксов
+        section, order = self._resolve_active_sort()
+        if section == 0:
+            self.phrase_model.sort(section, order)
 
         if self.checkbox_header:
             self.checkbox_header.set_checked(checked, emit_signal=False)
@@ -2066,61 +2372,31 @@ class MainPhraseTable(QTableWidget):
     def on_header_checked_sort_requested(self, checked_first: bool):
         self.sort_by_checked(checked_first)
 
-    def _row_key(self, row: int):
-        phrase_item = self.item(row, 1)
-        freq_item = self.item(row, 2)
-        if not phrase_item or not freq_item:
-            return None
-        phrase = phrase_item.text()
-        if isinstance(freq_item, FrequencyTableWidgetItem):
-            freq = freq_item.value
-        else:
-            try:
-                freq = int(freq_item.text())
-            except Exception:
-                freq = 0
+    def _row_key(self, row: int) -> Tuple[str, int]:
+        _, phrase, freq = self.phrase_model.rows[row]
         return phrase, freq
 
-    def on_item_changed(self, item: QTableWidgetItem):
-        if self._syncing_checkboxes:
-            return
-        if item.column() == 0:
-            key = self._row_key(item.row())
-            if key is not None:
-                if item.checkState() == Qt.Checked:
-                    self.checked_keys.add(key)
-                else:
-                    self.checked_keys.discard(key)
-            self.update_header_checkbox_state()
-            return
-
-        if item.column() not in (1, 2):
-            return
-
-        row = item.row()
-        phrase_item = self.item(row, 1)
-        freq_item = self.item(row, 2)
-        if not phrase_item or not freq_item:
-            return
-
-        source_index = None
-        if hasattr(phrase_item, "data"):
-            source_index = phrase_item.data(Qt.UserRole)
-
-        if not isinstance(source_index, int) or source_index < 0 or source_index >= len(self.current_data):
-            if 0 <= row < len(self.current_data):
-                source_index = row
-            else:
-                return
+    def on_check_toggled(self, row: int, checked: bool):
+        key = self._row_key(row)
+        if checked:
+            self.checked_keys.add(key)
+        else:
+            self.checked_keys.discard(key)
+        self.update_header_checkbox_state()
 
+    def on_cell_edited(self, row: int, column: int, value):
+        source_index = self.phrase_model.rows[row][0]
         old_phrase, old_freq = self.current_data[source_index]
-        new_phrase = phrase_item.text().strip() or old_phrase
-        try:
-            new_freq = int(freq_item.text())
-        except Exception:
-            new_freq = old_freq
-        if new_freq < 0:
-            new_freq = 0
+        new_phrase, new_freq = old_phrase, old_freq
+        if column == 1:
+            new_phrase = str(value).strip() or old_phrase
+        elif column == 2:
+            try:
+                new_freq = int(value)
+            except Exception:
+                new_freq = old_freq
+            if new_freq < 0:
+                new_freq = 0
 
         if (new_phrase, new_freq) == (old_phrase, old_freq):
             return
@@ -2135,28 +2411,27 @@ class MainPhraseTable(QTableWidget):
         self.apply_data_change(data)
 
     def update_header_checkbox_state(self):
-        if not self.checkbox_header or self.rowCount() == 0:
-            if self.checkbox_header:
-                self.checkbox_header.set_checked(False, emit_signal=False)
+        if not self.checkbox_header:
             return
-
-        all_checked = True
-        for row in range(self.rowCount()):
-            checkbox_item = self.item(row, 0)
-            if not checkbox_item or checkbox_item.checkState() != Qt.Checked:
-                all_checked = False
-                break
+        checked = self.checked_keys
+        rows = self.phrase_model.rows
+        all_checked = bool(rows) and bool(checked) and all(
+            (phrase, freq) in checked for _, phrase, freq in rows
+        )
         self.checkbox_header.set_checked(all_checked, emit_signal=False)
 
-    def delete_selected(self):
-        phrases_to_delete = set()
-        for row in range(self.rowCount()):
-            checkbox_item = self.item(row, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                phrase_item = self.item(row, 1)
-                if phrase_item:
-                    phrases_to_delete.add(phrase_item.text())
+    def checked_row_keys(self) -> List[Tuple[str, int]]:
+        """Отмеченные видимые строки (фраза, частотность) в порядке отображения"""
+        checked = self.checked_keys
+        if not checked:
+            return []
+        return [
+            (phrase, freq) for _, phrase, freq in self.phrase_model.rows
+            if (phrase, freq) in checked
+        ]
 
+    def delete_selected(self):
+        phrases_to_delete = set(phrase for phrase, _ in self.checked_row_keys())
         if not phrases_to_delete:
             return
 
@@ -2167,13 +2442,7 @@ class MainPhraseTable(QTableWidget):
         self.apply_data_change(data)
 
     def delete_highlighted(self):
-        phrases_to_delete = set()
-        selected_rows = set(item.row() for item in self.selectedItems())
-        for row in selected_rows:
-            phrase_item = self.item(row, 1)
-            if phrase_item:
-                phrases_to_delete.add(phrase_item.text())
-
+        phrases_to_delete = set(self._row_key(row)[0] for row in self.selected_rows())
         if not phrases_to_delete:
             return
 
@@ -2216,131 +2485,106 @@ class MainPhraseTable(QTableWidget):
         self.update_table(self.current_data, save_history=False)
 
     def update_table(self, data: List[Tuple[str, int]], save_history: bool = True):
-        self.current_data = data.copy()
-        self.checked_keys = {k for k in self.checked_keys if k in set(self.current_data)}
-
-        display_data = []
-        for source_index, (phrase, freq) in enumerate(self.current_data):
-            if self.stop_words:
-                phrase_words = set(phrase.lower().split())
-                if phrase_words.intersection(self.stop_words):
+        # Фильтр, поиск и undo/redo передают уже принадлежащий таблице список — копия не нужна
+        if data is not self.current_data:
+            self.current_data = data.copy()
+        if self.checked_keys:
+            # Множество строится один раз, а не заново для каждого отмеченного ключа
+            self.checked_keys &= set(self.current_data)
+
+        stop_words = self.stop_words
+        filter_by_search = bool(self.search_text and self.search_only_matches)
+        if not stop_words and not filter_by_search:
+            display_data = [(source_index, phrase, freq) for source_index, (phrase, freq) in enumerate(self.current_data)]
+        else:
+            is_match_lower = self._is_match_lower
+            display_data = []
+            for source_index, ((phrase, freq), phrase_lower) in enumerate(zip(self.current_data, self.current_lower())):
+                if stop_words and not stop_words.isdisjoint(phrase_lower.split()):
                     continue
-            if self.search_text and self.search_only_matches and not self.is_match(phrase):
-                continue
-            display_data.append((source_index, phrase, freq))
-
-        self.setSortingEnabled(False)
-        self.setRowCount(len(display_data))
-        self._syncing_checkboxes = True
-
-        for i, (source_index, phrase, freq) in enumerate(display_data):
-            checkbox = CheckboxTableWidgetItem()
-            checkbox.setFlags(Qt.ItemIsEnabled)
-            checkbox.setCheckState(Qt.Checked if (phrase, freq) in self.checked_keys else Qt.Unchecked)
-            self.setItem(i, 0, checkbox)
-
-            phrase_item = QTableWidgetItem(phrase)
-            phrase_item.setData(Qt.UserRole, source_index)
-            color = self.get_frequency_color(freq)
-            phrase_item.setBackground(QBrush(color))
-            is_dark = getattr(self, "current_theme", "light") == "dark"
-            if hasattr(phrase_item, "setForeground"):
-                phrase_item.setForeground(
-                    QBrush(QColor(242, 242, 247) if is_dark else QColor(0, 0, 0))
-                )
-
-            self.setItem(i, 1, phrase_item)
-
-            freq_item = FrequencyTableWidgetItem(freq)
-            freq_item.setData(Qt.UserRole, source_index)
-            freq_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            if hasattr(self, "get_frequency_text_color"):
-                freq_item.setForeground(QBrush(self.get_frequency_text_color(freq)))
-            else:
-                if freq >= 100000:
-                    freq_item.setForeground(QBrush(QColor(255, 59, 48)))
-                elif freq >= 10000:
-                    freq_item.setForeground(QBrush(QColor(255, 149, 0)))
-                elif freq >= 1000:
-                    freq_item.setForeground(QBrush(QColor(255, 204, 0)))
-                elif freq >= 100:
-                    freq_item.setForeground(QBrush(QColor(52, 199, 36)))
-                else:
-                    freq_item.setForeground(QBrush(QColor(142, 142, 147)))
-
-            self.setItem(i, 2, freq_item)
+                if filter_by_search and not is_match_lower(phrase_lower):
+                    continue
+                display_data.append((source_index, phrase, freq))
 
-        self._syncing_checkboxes = False
+        self.phrase_model.set_rows(display_data)
         self.update_header_checkbox_state()
-        self.setSortingEnabled(True)
         self._apply_active_sort()
         self.table_view_changed.emit()
 
         if save_history:
             self.save_state()
 
+    def current_lower(self) -> List[str]:
+        """Фразы current_data в нижнем регистре; пересчитываются только при замене списка"""
+        # current_data никогда не меняется на месте, поэтому достаточно сравнить сам список
+        if self._lower_source is not self.current_data:
+            self._lower_source = self.current_data
+            self._lower_phrases = [phrase.lower() for phrase, _ in self.current_data]
+        return self._lower_phrases
+
     def is_match(self, phrase: str) -> bool:
+        return self._is_match_lower(phrase.lower())
+
+    def _is_match_lower(self, phrase_lower: str) -> bool:
         if self.exact_search:
-            return bool(re.search(r'\b' + re.escape(self.search_text.lower()) + r'\b', phrase.lower()))
-        else:
-            return self.search_text.lower() in phrase.lower()
+            return self._exact_search_pattern.search(phrase_lower) is not None
+        return self._search_lower in phrase_lower
 
     def get_frequency_color(self, freq: int) -> QColor:
-        if getattr(self, "current_theme", "light") == "dark":
-            if freq >= 100000:
-                return QColor(62, 24, 26)
-            elif freq >= 10000:
-                return QColor(66, 44, 20)
-            elif freq >= 1000:
-                return QColor(64, 56, 20)
-            elif freq >= 100:
-                return QColor(24, 62, 30)
-            else:
-                return QColor(28, 28, 30)
-
-        if freq >= 100000:
-            return QColor(255, 235, 235)
-        elif freq >= 10000:
-            return QColor(255, 243, 235)
-        elif freq >= 1000:
-            return QColor(255, 250, 235)
-        elif freq >= 100:
-            return QColor(243, 255, 243)
-        else:
-            return QColor(255, 255, 255)
+        theme = "dark" if getattr(self, "current_theme", "light") == "dark" else "light"
+        return QColor(*self.FREQUENCY_BG_COLORS[theme][self.frequency_tier(freq)])
 
     def set_stop_words(self, stop_words: Set[str]):
         self.stop_words = stop_words
         self.update_table(self.current_data, save_history=False)
 
     def set_search(self, text: str, only_matches: bool, exact: bool):
+        # Без режима "Только совпадения" набор строк не меняется — достаточно перерисовать подсветку
+        rows_unchanged = not only_matches and not self.search_only_matches
         self.search_text = text
         self.search_only_matches = only_matches
         self.exact_search = exact
+        # Запрос приводится к нижнему регистру и компилируется один раз, а не для каждой строки
+        self._search_lower = text.lower()
+        self._exact_search_pattern = re.compile(r'\b' + re.escape(self._search_lower) + r'\b')
         self.current_search_index = 0
-        self.update_table(self.current_data, save_history=False)
+        if rows_unchanged:
+            self.viewport().update()
+        else:
+            self.update_table(self.current_data, save_history=False)
 
         if text and not only_matches:
             rows = self.get_matching_rows()
             if rows:
-                self.scrollToItem(self.item(rows[0], 1))
+                self.scrollTo(self.phrase_model.index(rows[0], 1))
                 self.selectRow(rows[0])
                 self.current_search_index = 0
 
-    def get_matching_rows(self):
-        rows = []
-        for row in range(self.rowCount()):
-            phrase_item = self.item(row, 1)
-            if phrase_item and self.is_match(phrase_item.text()):
-                rows.append(row)
-        return rows
+    def get_matching_rows(self) -> List[int]:
+        """Строки с совпадениями; пересчитываются только при смене строк модели или запроса"""
+        # Строки модели и current_data не меняются на месте, поэтому списки сравниваются по identity
+        key = self._matching_key
+        if (
+            key is None
+            or key[0] is not self.phrase_model.rows
+            or key[1] is not self.current_data
+            or key[2:] != (self.search_text, self.exact_search)
+        ):
+            lowered = self.current_lower()
+            is_match_lower = self._is_match_lower
+            self._matching_rows = [
+                row for row, (source_index, _, _) in enumerate(self.phrase_model.rows)
+                if is_match_lower(lowered[source_index])
+            ]
+            self._matching_key = (self.phrase_model.rows, self.current_data, self.search_text, self.exact_search)
+        return self._matching_rows
 
     def next_search_result(self):
         rows = self.get_matching_rows()
         if rows:
             self.current_search_index = (self.current_search_index + 1) % len(rows)
             row = rows[self.current_search_index]
-            self.scrollToItem(self.item(row, 1))
+            self.scrollTo(self.phrase_model.index(row, 1))
             self.selectRow(row)
             return self.current_search_index + 1, len(rows)
         return 0, 0
@@ -2350,7 +2594,7 @@ class MainPhraseTable(QTableWidget):
         if rows:
             self.current_search_index = (self.current_search_index - 1) % len(rows)
             row = rows[self.current_search_index]
-            self.scrollToItem(self.item(row, 1))
+            self.scrollTo(self.phrase_model.index(row, 1))
             self.selectRow(row)
             return self.current_search_index + 1, len(rows)
         return 0, 0
@@ -2359,12 +2603,7 @@ class MainPhraseTable(QTableWidget):
         return self.current_data.copy()
 
     def copy_selected(self):
-        selected = []
-        for row in range(self.rowCount()):
-            checkbox_item = self.item(row, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.Checked:
-                phrase = self.item(row, 1).text()
-                selected.append(phrase)
+        selected = [phrase for phrase, _ in self.checked_row_keys()]
 
         if selected:
             clipboard = QApplication.clipboard()
@@ -2383,8 +2622,8 @@ class MainPhraseTable(QTableWidget):
         labels = {}
         order = []
 
-        for phrase, _ in self.current_data:
-            key = phrase.lower().strip()
+        for (phrase, _), phrase_lower in zip(self.current_data, self.current_lower()):
+            key = phrase_lower.strip()
             if key not in counts:
                 counts[key] = 0
                 labels[key] = phrase.strip()
@@ -2456,43 +2695,132 @@ class FileLoader(QThread):
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
 
+    PROGRESS_INTERVAL = 0.1  # не чаще 10 обновлений в секунду
+    PROGRESS_CHECK_LINES = 10000
+
     def __init__(self, file_paths: List[str]):
         super().__init__()
         self.file_paths = file_paths
+        self._last_emit = 0.0
+        self._last_value = -1
+
+    def _emit_progress(self, value: float, force: bool = False):
+        """Отправка прогресса в UI с ограничением частоты; одинаковый процент не отправляется повторно"""
+        value = int(value)
+        if value == self._last_value:
+            return
+        now = time.monotonic()
+        if force or now - self._last_emit >= self.PROGRESS_INTERVAL:
+            self._last_emit = now
+            self._last_value = value
+            self.progress.emit(value)
 
     def run(self):
         all_phrases = []
+        file_count = len(self.file_paths)
 
         for i, file_path in enumerate(self.file_paths):
             try:
-                path = Path(file_path)
+                # Файл добавляется целиком: при ошибке частично прочитанные строки не попадают в список
+                all_phrases.extend(self._parse_file(file_path, i, file_count))
+            except Exception as e:
+                self.error.emit(f"Ошибка при загрузке {Path(file_path).name}: {str(e)}")
+            # Принудительно — только после последнего файла, иначе сотни мелких файлов дают сотни сигналов
+            self._emit_progress((i + 1) / file_count * 100, force=i + 1 == file_count)
 
-                if path.suffix.lower() in ['.xls', '.xlsx']:
-                    df = pd.read_excel(file_path)
-                    if len(df.columns) >= 2:
-                        for _, row in df.iterrows():
-                            phrase = str(row.iloc[0]).strip()
-                            freq = int(row.iloc[1]) if pd.notna(row.iloc[1]) else 0
-                            all_phrases.append((phrase, freq))
-                    else:
-                        phrases = df.iloc[:, 0].astype(str).str.strip().tolist()
-                        all_phrases.extend([(p, 0) for p in phrases])
+        self.finished.emit(all_phrases)
 
-                elif path.suffix.lower() == '.txt':
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        for line in lines:
-                            parts = line.strip().split('\t')
-                            phrase = parts[0]
-                            freq = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
-                            all_phrases.append((phrase, freq))
+    def _parse_file(self, file_path: str, index: int, file_count: int) -> List[Tuple[str, int]]:
+        """Чтение одного файла в список (фраза, частотность)"""
+        path = Path(file_path)
+        phrases_data = []
+
+        if path.suffix.lower() in ['.xls', '.xlsx']:
+            # pandas загружается только при работе с Excel: его импорт заметно замедляет запуск
+            import pandas as pd
+            df = pd.read_excel(file_path)
+            if len(df.columns) >= 2:
+                # Колонки преобразуются целиком вместо построчного iterrows
+                phrases = [str(value).strip() for value in df.iloc[:, 0].tolist()]
+                freqs = pd.to_numeric(df.iloc[:, 1]).fillna(0).tolist()
+                phrases_data.extend(zip(phrases, map(int, freqs)))
+            else:
+                phrases = df.iloc[:, 0].astype(str).str.strip().tolist()
+                phrases_data.extend([(p, 0) for p in phrases])
+
+        elif path.suffix.lower() == '.txt':
+            file_size = os.path.getsize(file_path) or 1
+            append = phrases_data.append  # метод берется один раз, а не на каждой строке
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    parts = line.strip().split('\t')
+                    phrase = parts[0]
+                    # isdecimal(), а не isdigit(): символы вроде '²' проходят isdigit(), но int() на них падает
+                    freq = int(parts[1]) if len(parts) > 1 and parts[1].isdecimal() else 0
+                    append((phrase, freq))
+
+                    if line_no % self.PROGRESS_CHECK_LINES == 0:
+                        # Позиция в байтах по буферу — приблизительная, но для прогресса достаточно
+                        done = min(f.buffer.tell() / file_size, 1.0)
+                        self._emit_progress((index + done) / file_count * 100)
+
+        return phrases_data
+
+
+class ExcelExportWorker(QThread):
+    """Запись Excel-файла в фоновом потоке, чтобы интерфейс не замирал на больших выгрузках"""
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
 
-                self.progress.emit(int((i + 1) / len(self.file_paths) * 100))
+    # Все незавершенные выгрузки приложения: окно дожидается их при закрытии
+    _active: Set["ExcelExportWorker"] = set()
 
-            except Exception as e:
-                self.error.emit(f"Ошибка при загрузке {path.name}: {str(e)}")
+    def __init__(self, file_path: str, sheets: List[Tuple[str, List[str], List[Tuple]]]):
+        super().__init__()
+        self.file_path = file_path
+        self.sheets = sheets
 
-        self.finished.emit(all_phrases)
+    def run(self):
+        try:
+            ExcelExporter.write_sheets(self.file_path, self.sheets)
+        except Exception as e:
+            self.error.emit(str(e))
+        else:
+            self.finished.emit(self.file_path)
+
+    @staticmethod
+    def launch(owner: QWidget, file_path: str, sheets: List[Tuple[str, List[str], List[Tuple]]], success_text: str):
+        """Запуск экспорта для виджета; результат показывается сообщением по завершении"""
+        ExcelExportWorker.start_for(
+            owner, file_path, sheets,
+            lambda _path: QMessageBox.information(owner, "Успех", success_text),
+            lambda message: QMessageBox.critical(owner, "Ошибка", f"Не удалось экспортировать: {message}"),
+        )
+
+    @staticmethod
+    def start_for(owner: QWidget, file_path: str, sheets: List[Tuple[str, List[str], List[Tuple]]],
+                  on_finished: Callable[[str], None], on_error: Callable[[str], None]) -> bool:
+        """Запуск экспорта с обработчиками результата; у виджета одновременно идет не больше одной записи"""
+        worker = getattr(owner, "_export_worker", None)
+        if worker is not None and worker.isRunning():
+            QMessageBox.warning(owner, "Предупреждение", "Экспорт уже выполняется")
+            return False
+
+        worker = ExcelExportWorker(file_path, sheets)
+        worker.finished.connect(lambda _path: ExcelExportWorker._active.discard(worker))
+        worker.error.connect(lambda _message: ExcelExportWorker._active.discard(worker))
+        worker.finished.connect(on_finished)
+        worker.error.connect(on_error)
+        owner._export_worker = worker
+        ExcelExportWorker._active.add(worker)
+        worker.start()
+        return True
+
+    @staticmethod
+    def wait_all():
+        """Ожидание всех незавершенных выгрузок"""
+        for worker in list(ExcelExportWorker._active):
+            worker.wait()
 
 
 class StopWordsWidget(QWidget):
@@ -2547,6 +2875,10 @@ class StopWordsWidget(QWidget):
         self.copy_btn.clicked.connect(self.copy_stop_words)
         btn_layout.addWidget(self.copy_btn)
 
+        self.paste_btn = ModernButton("Вставить")
+        self.paste_btn.clicked.connect(self.paste_stop_words)
+        btn_layout.addWidget(self.paste_btn)
+
         layout.addLayout(btn_layout)
 
         self.setLayout(layout)
@@ -2620,7 +2952,7 @@ class StopWordsWidget(QWidget):
             """)
             button_theme = "light"
 
-        for btn in (self.load_btn, self.remove_btn, self.clear_btn, self.copy_btn):
+        for btn in (self.load_btn, self.remove_btn, self.clear_btn, self.copy_btn, self.paste_btn):
             if hasattr(btn, "apply_theme"):
                 btn.apply_theme(button_theme)
 
@@ -2633,12 +2965,14 @@ class StopWordsWidget(QWidget):
             self.input_field.clear()
 
     def remove_stop_word(self):
-        current_item = self.list_widget.currentItem()
-        if current_item:
-            word = current_item.text()
+        row = self.list_widget.currentRow()
+        if row >= 0:
+            word = self.list_widget.item(row).text()
             updated = set(self.stop_words)
             updated.discard(word)
-            self._apply_stop_words_change(updated)
+            # Удаляем одну строку по индексу вместо перезаполнения всего списка
+            self.list_widget.takeItem(row)
+            self._apply_stop_words_change(updated, refresh_list=False)
 
     def clear_stop_words(self):
         self._apply_stop_words_change(set())
@@ -2648,16 +2982,36 @@ class StopWordsWidget(QWidget):
             clipboard = QApplication.clipboard()
             clipboard.setText('\n'.join(sorted(self.stop_words)))
 
+    def paste_stop_words(self):
+        """Вставка стоп-слов из буфера обмена, по одному на строку"""
+        self.import_stop_words(QApplication.clipboard().text().splitlines())
+
+    def import_stop_words(self, words: Iterable[str]) -> bool:
+        """Добавление набора стоп-слов одним изменением: один addItems, один сигнал, одна запись истории"""
+        new_words = {word.strip().lower() for word in words} - self.stop_words
+        new_words.discard('')
+        if not new_words:
+            return False
+        return self._apply_stop_words_change(self.stop_words | new_words)
+
     def load_stop_words(self, stop_words: Set[str]):
         self.stop_words = stop_words.copy()
-        self.list_widget.clear()
-        for word in sorted(self.stop_words):
-            self.list_widget.addItem(word)
-        self.history.set_initial_state(tuple(sorted(self.stop_words)))
+        self.history.set_initial_state(self._refresh_list())
 
     def get_stop_words(self) -> Set[str]:
         return self.stop_words.copy()
 
+    def _refresh_list(self) -> Tuple[str, ...]:
+        """Перезаполнение списка одним addItems без перерисовки на каждом слове"""
+        words = tuple(sorted(self.stop_words))
+        self.list_widget.setUpdatesEnabled(False)
+        try:
+            self.list_widget.clear()
+            self.list_widget.addItems(words)
+        finally:
+            self.list_widget.setUpdatesEnabled(True)
+        return words
+
     def load_from_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -2668,28 +3022,23 @@ class StopWordsWidget(QWidget):
         if file_path:
             try:
                 path = Path(file_path)
-                new_words = set()
                 if path.suffix.lower() in ['.xls', '.xlsx']:
+                    import pandas as pd
                     df = pd.read_excel(file_path)
-                    words = df.iloc[:, 0].astype(str).str.strip().str.lower().tolist()
-                    new_words = set(w for w in words if w)
+                    self.import_stop_words(df.iloc[:, 0].astype(str).tolist())
                 elif path.suffix.lower() == '.txt':
                     with open(file_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        new_words = set(line.strip().lower() for line in lines if line.strip())
-                self._apply_stop_words_change(self.stop_words | new_words)
+                        self.import_stop_words(f)
             except Exception as e:
                 QMessageBox.warning(self, "Ошибка", f"Ошибка при загрузке: {str(e)}")
 
-    def _apply_stop_words_change(self, updated: Set[str]) -> bool:
+    def _apply_stop_words_change(self, updated: Set[str], refresh_list: bool = True) -> bool:
         if updated == self.stop_words:
             return False
         self.stop_words = set(updated)
-        self.list_widget.clear()
-        for word in sorted(self.stop_words):
-            self.list_widget.addItem(word)
+        words = self._refresh_list() if refresh_list else tuple(sorted(self.stop_words))
         self.stop_words_changed.emit(self.stop_words.copy())
-        self.history.add_state(tuple(sorted(self.stop_words)))
+        self.history.add_state(words)
         return True
 
     def undo(self) -> bool:
@@ -2697,9 +3046,7 @@ class StopWordsWidget(QWidget):
         if state is None:
             return False
         self.stop_words = set(state)
-        self.list_widget.clear()
-        for word in sorted(self.stop_words):
-            self.list_widget.addItem(word)
+        self._refresh_list()
         self.stop_words_changed.emit(self.stop_words.copy())
         return True
 
@@ -2708,9 +3055,7 @@ class StopWordsWidget(QWidget):
         if state is None:
             return False
         self.stop_words = set(state)
-        self.list_widget.clear()
-        for word in sorted(self.stop_words):
-            self.list_widget.addItem(word)
+        self._refresh_list()
         self.stop_words_changed.emit(self.stop_words.copy())
         return True
 
@@ -2720,7 +3065,9 @@ class GroupingWidget(QWidget):
 
     def __init__(self):
         super().__init__()
+        self.processor = PhraseProcessor()
         self.groups = {}
+        self._grouped_phrases = None  # копия фраз, по которым построено текущее дерево
         self.current_theme = "light"
         self.setup_ui()
         self.apply_theme("light")
@@ -2748,6 +3095,8 @@ class GroupingWidget(QWidget):
 
         self.tree = QTreeWidget()
         self.tree.setHeaderLabels(["Группа / Фраза", "Частотность"])
+        # Все строки одной высоты: Qt не измеряет каждую строку при раскрытии и прокрутке
+        self.tree.setUniformRowHeights(True)
         layout.addWidget(self.tree)
 
         self.setLayout(layout)
@@ -2823,31 +3172,35 @@ class GroupingWidget(QWidget):
             self.export_btn.apply_theme("light")
 
     def update_groups(self, phrases: List[Tuple[str, int]]):
-        processor = PhraseProcessor()
-        self.groups = processor.group_phrases(phrases)
-
-        self.tree.clear()
+        # Сравнение списков дешевле перегруппировки и пересборки дерева (например, стоп-слово ничего не отсеяло)
+        if phrases == self._grouped_phrases:
+            return
+        self._grouped_phrases = list(phrases)
+        self.groups = self.processor.group_phrases(phrases)
 
+        frequency_brushes = MainPhraseTable.TREE_FREQUENCY_BRUSHES
+        # Элементы собираются без родителя и добавляются в дерево одним вызовом
+        top_items = []
         for group_name, group_phrases in self.groups.items():
-            group_item = QTreeWidgetItem(self.tree)
-            group_item.setText(0, f"{group_name} ({len(group_phrases)})")
-            group_item.setExpanded(True)
+            group_item = QTreeWidgetItem([f"{group_name} ({len(group_phrases)})"])
+            children = []
 
             for phrase, freq in group_phrases:
-                phrase_item = QTreeWidgetItem(group_item)
-                phrase_item.setText(0, phrase)
-                phrase_item.setText(1, str(freq))
+                phrase_item = QTreeWidgetItem([phrase, str(freq)])
+                children.append(phrase_item)
 
-                if freq >= 100000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 59, 48)))
-                elif freq >= 10000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 149, 0)))
-                elif freq >= 1000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 204, 0)))
-                elif freq >= 100:
-                    phrase_item.setForeground(1, QBrush(QColor(52, 199, 36)))
-                else:
-                    phrase_item.setForeground(1, QBrush(QColor(142, 142, 147)))
+                phrase_item.setForeground(1, frequency_brushes[MainPhraseTable.frequency_tier(freq)])
+
+            group_item.addChildren(children)
+            top_items.append(group_item)
+
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self.tree.clear()
+            self.tree.addTopLevelItems(top_items)
+            self.tree.expandAll()
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
     def export_groups(self):
         if not self.groups:
@@ -2862,16 +3215,12 @@ class GroupingWidget(QWidget):
         )
 
         if file_path:
-            try:
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    for group_name, group_phrases in self.groups.items():
-                        df = pd.DataFrame(group_phrases, columns=['Фраза', 'Частотность'])
-                        sheet_name = group_name[:31] if len(group_name) > 31 else group_name
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                QMessageBox.information(self, "Успех", f"Группы экспортированы")
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Не удалось экспортировать: {str(e)}")
+            sheet_names = ExcelExporter.unique_sheet_names(list(self.groups))
+            sheets = [
+                (sheet_name, ['Фраза', 'Частотность'], group_phrases)
+                for sheet_name, group_phrases in zip(sheet_names, self.groups.values())
+            ]
+            ExcelExportWorker.launch(self, file_path, sheets, "Группы экспортированы")
 
 
 class ClusteringWidget(QWidget):
@@ -2880,6 +3229,11 @@ class ClusteringWidget(QWidget):
     TREE_PHRASE_ROLE = 2002
     TREE_FREQ_ROLE = 2003
 
+    TOKEN_PATTERN = re.compile(r"[a-zA-Zа-яА-Я0-9_]+")
+    SPECIAL_CHARS_PATTERN = re.compile(r"[^\w\s]")
+    CYRILLIC_PATTERN = re.compile(r"[а-я]")
+    LATIN_PATTERN = re.compile(r"[a-z]")
+
     SERVICE_TOKENS = {
         "купить", "куплю", "купим", "купите", "покупка", "покупки",
         "заказать", "заказ", "заказы", "цена", "цены", "стоимость",
@@ -2990,6 +3344,7 @@ class ClusteringWidget(QWidget):
 
         self.tree = QTreeWidget()
         self.tree.setHeaderLabels(["Кластер / Фраза", "Частотность"])
+        self.tree.setUniformRowHeights(True)
         self.tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.show_tree_context_menu)
         layout.addWidget(self.tree)
@@ -3183,6 +3538,7 @@ class ClusteringWidget(QWidget):
 
         self.clusters = named_clusters
 
+        frequency_brushes = MainPhraseTable.TREE_FREQUENCY_BRUSHES
         self.tree.clear()
         for cluster_name, cluster_phrases in self.clusters.items():
             cluster_item = QTreeWidgetItem(self.tree)
@@ -3197,21 +3553,11 @@ class ClusteringWidget(QWidget):
                 phrase_item.setData(0, self.TREE_CLUSTER_ROLE, cluster_name)
                 phrase_item.setData(0, self.TREE_PHRASE_ROLE, phrase)
                 phrase_item.setData(0, self.TREE_FREQ_ROLE, int(freq))
-
-                if freq >= 100000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 59, 48)))
-                elif freq >= 10000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 149, 0)))
-                elif freq >= 1000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 204, 0)))
-                elif freq >= 100:
-                    phrase_item.setForeground(1, QBrush(QColor(52, 199, 36)))
-                else:
-                    phrase_item.setForeground(1, QBrush(QColor(142, 142, 147)))
+                phrase_item.setForeground(1, frequency_brushes[MainPhraseTable.frequency_tier(freq)])
 
     @staticmethod
     def _tokenize(text: str) -> Set[str]:
-        tokens = re.findall(r"[a-zA-Zа-яА-Я0-9_]+", text.lower())
+        tokens = ClusteringWidget.TOKEN_PATTERN.findall(text.lower())
         result = set()
         for token in tokens:
             if len(token) > 2 or (len(token) > 1 and any(ch.isdigit() for ch in token)):
@@ -3220,8 +3566,8 @@ class ClusteringWidget(QWidget):
 
     @staticmethod
     def _normalize(text: str) -> str:
-        cleaned = re.sub(r"[^\w\s]", " ", text.lower())
-        return re.sub(r"\s+", " ", cleaned).strip()
+        cleaned = ClusteringWidget.SPECIAL_CHARS_PATTERN.sub(" ", text.lower())
+        return " ".join(cleaned.split())
 
     @staticmethod
     def _token_signature(token: str) -> str:
@@ -3231,7 +3577,7 @@ class ClusteringWidget(QWidget):
         if token.isdigit():
             return token
 
-        if re.search(r"[а-я]", token):
+        if ClusteringWidget.CYRILLIC_PATTERN.search(token):
             for suffix in (
                 "иями", "ями", "ами", "ого", "ему", "ыми", "ими",
                 "его", "ому", "иях", "ах", "ях", "ия", "ие", "ий",
@@ -3243,7 +3589,7 @@ class ClusteringWidget(QWidget):
                     return token[:-len(suffix)]
             return token
 
-        if re.search(r"[a-z]", token):
+        if ClusteringWidget.LATIN_PATTERN.search(token):
             if token.endswith("ies") and len(token) > 4:
                 return token[:-3] + "y"
             for suffix in ("ing", "ers", "er", "ed", "es", "s"):
@@ -3472,22 +3818,6 @@ class ClusteringWidget(QWidget):
             name = name[0].upper() + name[1:]
         return name
 
-    @staticmethod
-    def _safe_excel_sheet_name(name: str, used_names: Set[str]) -> str:
-        cleaned = re.sub(r"[:\\/?*\[\]]", " ", str(name))
-        cleaned = re.sub(r"\s+", " ", cleaned).strip() or "Кластер"
-        cleaned = cleaned[:31].strip() or "Кластер"
-
-        candidate = cleaned
-        counter = 2
-        while candidate in used_names:
-            suffix = f"_{counter}"
-            base = cleaned[:max(1, 31 - len(suffix))].rstrip()
-            candidate = f"{base}{suffix}".strip()
-            counter += 1
-        used_names.add(candidate)
-        return candidate
-
     @staticmethod
     def _safe_export_file_stem(text: str, fallback: str = "clusters") -> str:
         cleaned = re.sub(r'[\\/:*?"<>|]+', "_", str(text))
@@ -3509,16 +3839,12 @@ class ClusteringWidget(QWidget):
         if not file_path:
             return
 
-        try:
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                used_sheet_names = set()
-                for cluster_name, cluster_phrases in cluster_map.items():
-                    df = pd.DataFrame(cluster_phrases, columns=['Фраза', 'Частотность'])
-                    sheet_name = self._safe_excel_sheet_name(cluster_name, used_sheet_names)
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-            QMessageBox.information(self, "Успех", success_text)
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Не удалось экспортировать: {str(e)}")
+        sheet_names = ExcelExporter.unique_sheet_names([str(cluster_name) for cluster_name in cluster_map])
+        sheets = [
+            (sheet_name, ['Фраза', 'Частотность'], cluster_phrases)
+            for sheet_name, cluster_phrases in zip(sheet_names, cluster_map.values())
+        ]
+        ExcelExportWorker.launch(self, file_path, sheets, success_text)
 
     def show_tree_context_menu(self, pos):
         item = self.tree.itemAt(pos)
@@ -3963,9 +4289,54 @@ class FoldersWidget(QWidget):
     folders_changed = pyqtSignal()
     phrases_back = pyqtSignal(list, bool)  # list of (folder_name, phrase, freq), is_move
 
+    # Имя папки и частотность хранятся в элементах, чтобы не разбирать текст строк
+    FOLDER_NAME_ROLE = Qt.UserRole + 102
+    FREQUENCY_ROLE = Qt.UserRole + 103
+
+    MENU_STYLES = {
+        "dark": """
+            QMenu {
+                background-color: #2c2c2e;
+                color: #f2f2f7;
+                border: 1px solid #4b4b50;
+                border-radius: 8px;
+                padding: 5px;
+                font-size: 13px;
+            }
+            QMenu::item {
+                padding: 6px 20px;
+                border-radius: 4px;
+            }
+            QMenu::item:selected {
+                background-color: #3a3a3c;
+            }
+        """,
+        "light": """
+            QMenu {
+                background-color: #ffffff;
+                color: #000000;
+                border: 1px solid #c7c7cc;
+                border-radius: 8px;
+                padding: 5px;
+                font-size: 13px;
+            }
+            QMenu::item {
+                padding: 6px 20px;
+                border-radius: 4px;
+            }
+            QMenu::item:selected {
+                background-color: #e5e5ea;
+            }
+        """,
+    }
+
     def __init__(self):
         super().__init__()
         self.folders = {}
+        self._folder_items: Dict[str, QTreeWidgetItem] = {}  # элементы папок в дереве по имени
+        # Шрифты дерева создаются один раз, а не при каждом обновлении (после создания QApplication)
+        self.folder_font = QFont("Arial", 13, QFont.DemiBold)
+        self.phrase_font = QFont("Arial", 12)
         self.history = HistoryManager()
         self.current_theme = "light"
         self.setup_ui()
@@ -4185,42 +4556,10 @@ class FoldersWidget(QWidget):
             }
         """)
 
-    def _menu_style(self) -> str:
-        if self.current_theme == "dark":
-            return """
-                QMenu {
-                    background-color: #2c2c2e;
-                    color: #f2f2f7;
-                    border: 1px solid #4b4b50;
-                    border-radius: 8px;
-                    padding: 5px;
-                    font-size: 13px;
-                }
-                QMenu::item {
-                    padding: 6px 20px;
-                    border-radius: 4px;
-                }
-                QMenu::item:selected {
-                    background-color: #3a3a3c;
-                }
-            """
-        return """
-            QMenu {
-                background-color: #ffffff;
-                color: #000000;
-                border: 1px solid #c7c7cc;
-                border-radius: 8px;
-                padding: 5px;
-                font-size: 13px;
-            }
-            QMenu::item {
-                padding: 6px 20px;
-                border-radius: 4px;
-            }
-            QMenu::item:selected {
-                background-color: #e5e5ea;
-            }
-        """
+    def _create_menu(self) -> QMenu:
+        menu = QMenu(self)
+        menu.setStyleSheet(self.MENU_STYLES["dark" if self.current_theme == "dark" else "light"])
+        return menu
 
     def eventFilter(self, obj, event):
         if obj is self.tree.viewport() and event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
@@ -4231,7 +4570,7 @@ class FoldersWidget(QWidget):
                 if index.isValid() and index.column() == 0:
                     rect = self.tree.visualRect(index)
                     if pos.x() < rect.left():
-                        folder_name = item.text(0).split(" (")[0]
+                        folder_name = item.data(0, self.FOLDER_NAME_ROLE)
                         self.choose_folder_color(folder_name)
                         event.accept()
                         return True
@@ -4299,9 +4638,8 @@ class FoldersWidget(QWidget):
             return
 
         if len(items) == 1 and items[0].parent() is None:
-            folder_name = items[0].text(0).split(" (")[0]
-            menu = QMenu(self)
-            menu.setStyleSheet(self._menu_style())
+            folder_name = items[0].data(0, self.FOLDER_NAME_ROLE)
+            menu = self._create_menu()
 
             rename_action = menu.addAction("Переименовать папку")
             rename_action.triggered.connect(lambda: self.rename_folder(folder_name))
@@ -4328,15 +4666,11 @@ class FoldersWidget(QWidget):
             selected = []
             for item in items:
                 if item.parent() is not None:
-                    folder_name = item.parent().text(0).split(" (")[0]
-                    phrase = item.text(0)
-                    freq_str = item.text(1)
-                    freq = int(freq_str) if freq_str.isdigit() else 0
-                    selected.append((folder_name, phrase, freq))
+                    folder_name = item.parent().data(0, self.FOLDER_NAME_ROLE)
+                    selected.append((folder_name, item.text(0), item.data(1, self.FREQUENCY_ROLE)))
 
             if selected:
-                menu = QMenu(self)
-                menu.setStyleSheet(self._menu_style())
+                menu = self._create_menu()
 
                 copy_back = menu.addAction("Копировать обратно")
                 copy_back.triggered.connect(lambda: self.phrases_back.emit(selected, False))
@@ -4352,10 +4686,15 @@ class FoldersWidget(QWidget):
                 menu.exec_(self.tree.mapToGlobal(position))
 
     def batch_remove_from_folder(self, selected: List[Tuple[str, str, int]]):
-        before = self._folders_snapshot()
+        # Фразы группируются по папкам: каждая папка фильтруется один раз, а не на каждую фразу
+        by_folder = defaultdict(set)
         for folder_name, phrase, _ in selected:
+            by_folder[folder_name].add(phrase)
+
+        before = self._folders_snapshot()
+        for folder_name, phrases in by_folder.items():
             if folder_name in self.folders:
-                self.folders[folder_name].remove_phrase(phrase)
+                self.folders[folder_name].remove_phrases(phrases)
         self._commit_if_changed(before)
 
     def clear_folder(self, folder_name: str):
@@ -4370,11 +4709,13 @@ class FoldersWidget(QWidget):
             self.folders[folder_name].remove_phrase(phrase)
             self._commit_if_changed(before)
 
-    def add_phrases_to_folder(self, data: List[Tuple[str, str, int]]):
+    def add_phrases_to_folder(self, folder_name: str, phrases: List[Tuple[str, int]]):
+        folder = self.folders.get(folder_name)
+        if folder is None:
+            return
         before = self._folders_snapshot()
-        for folder_name, phrase, freq in data:
-            if folder_name in self.folders:
-                self.folders[folder_name].add_phrase(phrase, freq)
+        for phrase, freq in phrases:
+            folder.add_phrase(phrase, freq)
         self._commit_if_changed(before)
 
     def choose_folder_color(self, folder_name: str):
@@ -4404,58 +4745,91 @@ class FoldersWidget(QWidget):
         return self._commit_if_changed(before)
 
     def update_tree(self):
-        self.tree.clear()
-        folder_font = QFont("Arial", 13, QFont.DemiBold)
-        phrase_font = QFont("Arial", 12)
+        folder_font = self.folder_font
         default_folder_color = QColor(36, 46, 66)
         folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
         is_dark = getattr(self, "current_theme", "light") == "dark"
         text_color = QColor(242, 242, 247) if is_dark else QColor(0, 0, 0)
-        phrase_color = QColor(230, 230, 235) if is_dark else QColor(34, 34, 38)
+        folder_fg = QBrush(text_color)
 
+        self._folder_items = {}
+        top_items = []
         for folder_name, folder in self.folders.items():
             folder_color = QColor(folder.color) if getattr(folder, "color", None) else default_folder_color
             if not folder_color.isValid():
                 folder_color = default_folder_color
-            folder_fg = QBrush(text_color)
             folder_bg = None
             if getattr(folder, "color", None):
                 tint_color = QColor(folder_color)
                 tint_color.setAlpha(52)
                 folder_bg = QBrush(tint_color)
 
-            folder_item = QTreeWidgetItem(self.tree)
-            folder_item.setText(0, f"{folder_name} ({len(folder.phrases)})")
+            folder_item = QTreeWidgetItem([f"{folder_name} ({len(folder.phrases)})"])
             folder_item.setIcon(0, folder_icon)
             folder_item.setFont(0, folder_font)
             folder_item.setFont(1, folder_font)
             folder_item.setForeground(0, folder_fg)
             folder_item.setForeground(1, folder_fg)
+            folder_item.setData(0, self.FOLDER_NAME_ROLE, folder_name)
             folder_item.setData(0, FolderColorDelegate.COLOR_ROLE, getattr(folder, "color", None))
             folder_item.setData(1, FolderColorDelegate.COLOR_ROLE, getattr(folder, "color", None))
             if folder_bg is not None:
                 folder_item.setBackground(0, folder_bg)
                 folder_item.setBackground(1, folder_bg)
-            folder_item.setExpanded(True)
 
-            for phrase, freq in folder.phrases:
-                phrase_item = QTreeWidgetItem(folder_item)
-                phrase_item.setText(0, phrase)
-                phrase_item.setText(1, str(freq))
-                phrase_item.setFont(0, phrase_font)
-                phrase_item.setFont(1, phrase_font)
-                phrase_item.setForeground(0, QBrush(phrase_color))
-
-                if freq >= 100000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 59, 48)))
-                elif freq >= 10000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 149, 0)))
-                elif freq >= 1000:
-                    phrase_item.setForeground(1, QBrush(QColor(255, 204, 0)))
-                elif freq >= 100:
-                    phrase_item.setForeground(1, QBrush(QColor(52, 199, 36)))
-                else:
-                    phrase_item.setForeground(1, QBrush(QColor(142, 142, 147)))
+            folder_item.addChildren(self._phrase_items(folder.phrases))
+            self._folder_items[folder_name] = folder_item
+            top_items.append(folder_item)
+
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self.tree.clear()
+            self.tree.addTopLevelItems(top_items)
+            self.tree.expandAll()
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+    def _phrase_items(self, phrases: List[Tuple[str, int]]) -> List[QTreeWidgetItem]:
+        """Элементы фраз папки (без родителя)"""
+        phrase_font = self.phrase_font
+        is_dark = getattr(self, "current_theme", "light") == "dark"
+        phrase_fg = QBrush(QColor(230, 230, 235) if is_dark else QColor(34, 34, 38))
+        frequency_brushes = MainPhraseTable.TREE_FREQUENCY_BRUSHES
+
+        items = []
+        for phrase, freq in phrases:
+            phrase_item = QTreeWidgetItem([phrase, str(freq)])
+            phrase_item.setFont(0, phrase_font)
+            phrase_item.setFont(1, phrase_font)
+            phrase_item.setForeground(0, phrase_fg)
+            phrase_item.setForeground(1, frequency_brushes[MainPhraseTable.frequency_tier(freq)])
+            phrase_item.setData(1, self.FREQUENCY_ROLE, freq)
+            items.append(phrase_item)
+        return items
+
+    def _update_changed_folders(self, before_snapshot: Dict[str, Dict[str, object]],
+                                after_snapshot: Dict[str, Dict[str, object]]):
+        """Перезаполнение только папок с изменившимися фразами; дерево целиком — если менялись сами папки"""
+        same_folders = (
+            list(before_snapshot) == list(after_snapshot) == list(self._folder_items)
+            and all(before_snapshot[name]["color"] == data["color"] for name, data in after_snapshot.items())
+        )
+        if not same_folders:
+            self.update_tree()
+            return
+
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for folder_name, data in after_snapshot.items():
+                phrases = data["phrases"]
+                if phrases == before_snapshot[folder_name]["phrases"]:
+                    continue
+                folder_item = self._folder_items[folder_name]
+                folder_item.takeChildren()
+                folder_item.addChildren(self._phrase_items(phrases))
+                folder_item.setText(0, f"{folder_name} ({len(phrases)})")
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
     def export_folders(self):
         if not self.folders:
@@ -4470,28 +4844,29 @@ class FoldersWidget(QWidget):
         )
 
         if file_path:
-            try:
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    for folder_name, folder in self.folders.items():
-                        if folder.phrases:
-                            df = pd.DataFrame(folder.phrases, columns=['Фраза', 'Частотность'])
-                            sheet_name = folder_name[:31] if len(folder_name) > 31 else folder_name
-                            df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                QMessageBox.information(self, "Успех", "Папки экспортированы")
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Не удалось экспортировать: {str(e)}")
+            filled = [(name, folder) for name, folder in self.folders.items() if folder.phrases]
+            sheet_names = ExcelExporter.unique_sheet_names([name for name, _ in filled])
+            # Копии списков: папки можно менять, пока идет запись
+            sheets = [
+                (sheet_name, ['Фраза', 'Частотность'], list(folder.phrases))
+                for sheet_name, (_, folder) in zip(sheet_names, filled)
+            ]
+            ExcelExportWorker.launch(self, file_path, sheets, "Папки экспортированы")
 
     def load_folders(self, folders: Dict[str, Folder]):
-        self.folders = {k: copy.deepcopy(v) for k, v in folders.items()}
+        before = self._folders_snapshot()
+        self.folders = {k: v.copy() for k, v in folders.items()}
         for folder in self.folders.values():
             if not hasattr(folder, "color"):
                 folder.color = None
-        self.update_tree()
-        self.history.set_initial_state(self._folders_snapshot())
+        after = self._folders_snapshot()
+        # Те же папки (например, при возврате на вкладку) дерево не перестраивают
+        if after != before:
+            self._update_changed_folders(before, after)
+        self.history.set_initial_state(after)
 
     def get_folders(self) -> Dict[str, Folder]:
-        return {k: copy.deepcopy(v) for k, v in self.folders.items()}
+        return {k: v.copy() for k, v in self.folders.items()}
 
     def _folders_snapshot(self) -> Dict[str, Dict[str, object]]:
         snapshot = {}
@@ -4522,7 +4897,7 @@ class FoldersWidget(QWidget):
         after_snapshot = self._folders_snapshot()
         if after_snapshot == before_snapshot:
             return False
-        self.update_tree()
+        self._update_changed_folders(before_snapshot, after_snapshot)
         self.folders_changed.emit()
         self.history.add_state(after_snapshot)
         return True
@@ -6039,7 +6414,10 @@ class MainWindow(QMainWindow):
         reply = QMessageBox.question(self, "Удалить вкладку", f"Удалить вкладку '{name}'?",
                                      QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
+            tab = self.phrase_tabs.widget(index)
             self.phrase_tabs.removeTab(index)
+            # removeTab не удаляет виджет, он остается дочерним у QTabWidget
+            tab.deleteLater()
             del self.phrase_lists[name]
             self.update_global_grouping()
             self.update_phrase_count()
@@ -6094,6 +6472,11 @@ class MainWindow(QMainWindow):
     def get_current_tab(self) -> PhraseTab:
         return self.phrase_tabs.currentWidget()
 
+    def get_tab(self, name: str) -> Optional[PhraseTab]:
+        """Вкладка списка по имени; None, если ее уже закрыли или переименовали"""
+        tabs = self.phrase_tabs
+        return next((tab for tab in map(tabs.widget, range(tabs.count())) if tab.name == name), None)
+
     def get_current_table(self) -> MainPhraseTable:
         tab = self.get_current_tab()
         return tab.table if tab else None
@@ -6121,20 +6504,16 @@ class MainWindow(QMainWindow):
                 if not phrases:
                     return
 
-                current_table = current_tab.table
-                updated_data = current_table.current_data + [(phrase, 0) for phrase in phrases]
-                if current_table.apply_data_change(updated_data):
-                    self.update_phrase_count()
-                    self.update_grouping_widget()
-                    self.update_global_grouping()
+                # Счетчик и группировки обновит on_table_data_changed — повторная перегруппировка не нужна
+                updated_data = current_tab.table.current_data + [(phrase, 0) for phrase in phrases]
+                current_tab.table.apply_data_change(updated_data)
 
     def on_phrases_to_folder(self, folder_name: str, phrases: List[Tuple[str, int]], is_global: bool, is_move: bool):
-        data = [(folder_name, p, f) for p, f in phrases]
         if is_global:
-            self.general_folders.add_phrases_to_folder(data)
-            self.global_folders = self.general_folders.get_folders()
+            # self.global_folders обновит update_all_tables_global_folders по сигналу folders_changed
+            self.general_folders.add_phrases_to_folder(folder_name, phrases)
         else:
-            self.folders_widget.add_phrases_to_folder(data)
+            self.folders_widget.add_phrases_to_folder(folder_name, phrases)
             current_list = self.get_current_phrase_list()
             if current_list:
                 current_list.folders = self.folders_widget.get_folders()
@@ -6144,20 +6523,18 @@ class MainWindow(QMainWindow):
             current_table = self.get_current_table()
             if current_table:
                 phrases_set = set(p.lower().strip() for p, f in phrases)
-                updated_data = [(p, f) for p, f in current_table.current_data if
-                                p.lower().strip() not in phrases_set]
-                if current_table.apply_data_change(updated_data):
-                    current_list = self.get_current_phrase_list()
-                    if current_list:
-                        current_list.phrases = current_table.current_data
-                    self.update_phrase_count()
-                    self.update_grouping_widget()
-                    self.update_global_grouping()
+                updated_data = [
+                    item for item, phrase_lower in zip(current_table.current_data, current_table.current_lower())
+                    if phrase_lower.strip() not in phrases_set
+                ]
+                # Список, счетчик и группировки обновит on_table_data_changed
+                current_table.apply_data_change(updated_data)
 
     def on_phrases_back(self, selected: List[Tuple[str, str, int]], is_move: bool, is_global: bool):
         current_table = self.get_current_table()
         if current_table:
-            existing = {p.lower().strip() for p, f in current_table.current_data}
+            # Нижний регистр фраз уже посчитан таблицей
+            existing = {phrase_lower.strip() for phrase_lower in current_table.current_lower()}
             updated_data = current_table.current_data.copy()
             for _, phrase, freq in selected:
                 if phrase.lower().strip() not in existing:
@@ -6165,11 +6542,9 @@ class MainWindow(QMainWindow):
                     existing.add(phrase.lower().strip())
             current_table.apply_data_change(updated_data)
             if is_move:
-                if is_global:
-                    for folder_name, phrase, _ in selected:
-                        self.general_folders.remove_from_folder(folder_name, phrase)
-                else:
-                    self.folders_widget.batch_remove_from_folder(selected)
+                # Одно изменение папок на всю пачку: один снимок истории и одно обновление дерева
+                folders_widget = self.general_folders if is_global else self.folders_widget
+                folders_widget.batch_remove_from_folder(selected)
             current_list = self.get_current_phrase_list()
             if current_list:
                 current_list.phrases = current_table.current_data
@@ -6184,7 +6559,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Ошибка", "Список с таким именем уже существует")
                 return
             self.create_new_tab(name)
-            current_tab = [tab for tab in [self.phrase_tabs.widget(i) for i in range(self.phrase_tabs.count())] if tab.name == name][0]
+            current_tab = self.get_tab(name)
             if current_tab:
                 current_list = self.phrase_lists[name]
                 current_tab.table.load_data([])
@@ -6218,8 +6593,7 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Загрузка...")
 
     def on_files_loaded(self, data: List[Tuple[str, int]], name: str):
-        current_tab = \
-        [tab for tab in [self.phrase_tabs.widget(i) for i in range(self.phrase_tabs.count())] if tab.name == name][0]
+        current_tab = self.get_tab(name)
         if current_tab:
             current_list = self.phrase_lists[name]
             current_list.phrases.extend(data)
@@ -6286,7 +6660,7 @@ class MainWindow(QMainWindow):
         total = len(current_table.current_data)
         self.phrase_count_label.setText(f"Фраз: {total}")
 
-        filtered = current_table.rowCount()
+        filtered = current_table.phrase_model.rowCount()
         if filtered != total:
             self.filtered_count_label.setText(f"(после фильтра: {filtered})")
         else:
@@ -6329,7 +6703,8 @@ class MainWindow(QMainWindow):
         # Синхронизируем текущую вкладку для актуальных данных
         self.sync_current_tab()
 
-        all_phrases = self.get_all_phrases()
+        # Списки вкладок фильтруются потоком, без промежуточного общего списка
+        all_phrases = chain.from_iterable(pl.phrases for pl in self.phrase_lists.values())
         filtered = PhraseProcessor.filter_by_stop_words(all_phrases, self.global_stop_words)
         self.general_grouping.update_groups(filtered)
         if (
@@ -6342,12 +6717,6 @@ class MainWindow(QMainWindow):
         ):
             self.general_clustering.update_clusters(filtered)
 
-    def get_all_phrases(self) -> List[Tuple[str, int]]:
-        all_p = []
-        for pl in self.phrase_lists.values():
-            all_p.extend(pl.phrases)
-        return all_p
-
     def save_list(self):
         # Синхронизируем текущую вкладку перед сохранением
         self.sync_current_tab()
@@ -6362,19 +6731,15 @@ class MainWindow(QMainWindow):
             )
 
             if file_path:
-                try:
-                    current_list = self.phrase_lists[current_tab.name]
-                    filtered_data = PhraseProcessor.filter_by_stop_words(
-                        current_list.phrases, current_list.stop_words | self.global_stop_words
-                    )
-                    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                        df_phrases = pd.DataFrame(filtered_data, columns=['Фраза', 'Частотность'])
-                        df_phrases.to_excel(writer, sheet_name='Phrases', index=False)
-                        df_stop = pd.DataFrame(list(current_list.stop_words), columns=['Стоп-слова'])
-                        df_stop.to_excel(writer, sheet_name='StopWords', index=False)
-                    self.status_bar.showMessage(f"Сохранено: {Path(file_path).name}")
-                except Exception as e:
-                    QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить: {str(e)}")
+                current_list = self.phrase_lists[current_tab.name]
+                # Строки копируются здесь: поток записи не должен читать списки, которые меняются в интерфейсе
+                filtered_data = list(PhraseProcessor.filter_by_stop_words(
+                    current_list.phrases, current_list.stop_words | self.global_stop_words
+                ))
+                self._start_excel_save(file_path, [
+                    ('Phrases', ['Фраза', 'Частотность'], filtered_data),
+                    ('StopWords', ['Стоп-слова'], [(word,) for word in current_list.stop_words]),
+                ])
 
     def save_all(self):
         # Синхронизируем текущую вкладку перед сохранением
@@ -6388,20 +6753,33 @@ class MainWindow(QMainWindow):
         )
 
         if file_path:
-            try:
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    for name, pl in self.phrase_lists.items():
-                        filtered = PhraseProcessor.filter_by_stop_words(pl.phrases,
-                                                                        pl.stop_words | self.global_stop_words)
-                        df_ph = pd.DataFrame(filtered, columns=['Фраза', 'Частотность'])
-                        df_ph.to_excel(writer, sheet_name=f"{name}_Phrases", index=False)
-                        df_stop = pd.DataFrame(list(pl.stop_words), columns=['Стоп-слова'])
-                        df_stop.to_excel(writer, sheet_name=f"{name}_Stop", index=False)
-                    df_global_stop = pd.DataFrame(list(self.global_stop_words), columns=['Стоп-слова'])
-                    df_global_stop.to_excel(writer, sheet_name="Obshchee_Stop", index=False)
-                self.status_bar.showMessage(f"Сохранено: {Path(file_path).name}")
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить: {str(e)}")
+            sheets = []
+            # Название списка укорачивается так, чтобы суффикс листа не обрезался
+            name_limit = ExcelExporter.SHEET_NAME_LIMIT - len("_Phrases")
+            for name, pl in self.phrase_lists.items():
+                filtered = list(PhraseProcessor.filter_by_stop_words(pl.phrases,
+                                                                     pl.stop_words | self.global_stop_words))
+                sheets.append((f"{name[:name_limit]}_Phrases", ['Фраза', 'Частотность'], filtered))
+                sheets.append((f"{name[:name_limit]}_Stop", ['Стоп-слова'], [(word,) for word in pl.stop_words]))
+            sheets.append(("Obshchee_Stop", ['Стоп-слова'], [(word,) for word in self.global_stop_words]))
+            sheet_names = ExcelExporter.unique_sheet_names([title for title, _, _ in sheets])
+            sheets = [(sheet_name, header, rows) for sheet_name, (_, header, rows) in zip(sheet_names, sheets)]
+            self._start_excel_save(file_path, sheets)
+
+    def _start_excel_save(self, file_path: str, sheets: List[Tuple[str, List[str], List[Tuple]]]):
+        """Запись Excel в фоновом потоке; результат выводится в строку состояния"""
+        started = ExcelExportWorker.start_for(
+            self, file_path, sheets,
+            lambda path: self.status_bar.showMessage(f"Сохранено: {Path(path).name}"),
+            lambda message: QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить: {message}"),
+        )
+        if started:
+            self.status_bar.showMessage("Сохранение...")
+
+    def closeEvent(self, event):
+        # Незавершенная запись иначе оборвется вместе с приложением и оставит поврежденный файл
+        ExcelExportWorker.wait_all()
+        super().closeEvent(event)
 
     def save_session(self):
         if self.current_session_path:
@@ -6419,13 +6797,23 @@ class MainWindow(QMainWindow):
         # Синхронизируем текущую вкладку перед сохранением
         self.sync_current_tab()
 
+        # Сессия пишется во временный файл и подменяет старую только целиком:
+        # сбой посреди записи не оставит обрезанный файл вместо рабочей сессии
+        tmp_path = file_path + ".tmp"
         try:
-            with open(file_path, 'wb') as f:
+            with open(tmp_path, 'wb') as f:
                 pickle.dump(
                     (self.phrase_lists, self.global_stop_words, self.global_folders, self.phrase_tabs.currentIndex()),
                     f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
             self.status_bar.showMessage(f"Session saved: {Path(file_path).name}")
         except Exception as e:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
             QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить сессию: {str(e)}")
 
     def load_session(self):
@@ -6434,38 +6822,43 @@ class MainWindow(QMainWindow):
             try:
                 with open(file_path, 'rb') as f:
                     self.phrase_lists, self.global_stop_words, self.global_folders, current_index = pickle.load(f)
-                # Clear tabs
-                while self.phrase_tabs.count() > 0:
-                    self.phrase_tabs.removeTab(0)
-                # Recreate tabs
-                for name, pl in self.phrase_lists.items():
-                    tab = PhraseTab()
-                    tab.name = name
-                    tab.search_widget.search_changed.connect(
-                        lambda t, o, e, tb=tab: self.on_search_changed(tb, t, o, e))
-                    tab.search_widget.prev_btn.clicked.connect(lambda checked, tb=tab: self.prev_search(tb))
-                    tab.search_widget.next_btn.clicked.connect(lambda checked, tb=tab: self.next_search(tb))
-                    tab.table.phrases_to_folder.connect(
-                        lambda fn, phrases, is_global, is_move, tb=tab: self.on_phrases_to_folder(fn, phrases,
-                                                                                                  is_global, is_move))
-                    tab.table.table_view_changed.connect(lambda tb=tab: self.on_table_view_changed(tb))
-                    tab.table.table_data_changed.connect(lambda tb=tab: self.on_table_data_changed(tb))
-                    self.phrase_tabs.addTab(tab, name)
-                    tab.table.load_data(pl.phrases)
-                    tab.table.history = pl.history
-                    if tab.table.history.current_index < 0:
-                        tab.table.history.set_initial_state(tab.table.current_data)
-                    tab.table.set_stop_words(pl.stop_words | self.global_stop_words)
-                    tab.table.set_folders(pl.folders)
-                    tab.table.set_global_folders(self.global_folders)
+                # Пока вкладки пересоздаются, currentChanged не отправляется: обработчик перенес бы
+                # состояние удаляемых вкладок в уже загруженные списки и перезагружал бы каждую вкладку
+                self.phrase_tabs.blockSignals(True)
+                self.phrase_tabs.setUpdatesEnabled(False)
+                try:
+                    # Clear tabs
+                    while self.phrase_tabs.count() > 0:
+                        tab = self.phrase_tabs.widget(0)
+                        self.phrase_tabs.removeTab(0)
+                        tab.deleteLater()
+                    # Recreate tabs
+                    for name, pl in self.phrase_lists.items():
+                        tab = self._new_phrase_tab(name)
+                        self.phrase_tabs.addTab(tab, name)
+                        # Стоп-слова задаются до загрузки: модель сбрасывается один раз уже отфильтрованными строками
+                        tab.table.stop_words = pl.stop_words | self.global_stop_words
+                        tab.table.load_data(pl.phrases)
+                        tab.table.history = pl.history
+                        if tab.table.history.current_index < 0:
+                            tab.table.history.set_initial_state(tab.table.current_data)
+                        tab.table.set_folders(pl.folders)
+                        tab.table.set_global_folders(self.global_folders)
+                finally:
+                    self.phrase_tabs.setUpdatesEnabled(True)
+                    self.phrase_tabs.blockSignals(False)
+                # Прежние вкладки удалены, синхронизировать при переключении нечего
+                self._prev_phrase_tab_index = -1
                 self.general_stop.load_stop_words(self.global_stop_words)
                 self.general_folders.load_folders(self.global_folders)
-                self.update_global_grouping()
-                self._reposition_phrase_tab_plus()
-                self.apply_theme(self.theme_mode)
+                # Панели стоп-слов и папок загружаются для новой текущей вкладки до общей группировки:
+                # sync_current_tab внутри нее иначе записал бы в список состояние прежней сессии
                 if self.phrase_tabs.count() > 0:
                     self.phrase_tabs.setCurrentIndex(min(current_index, self.phrase_tabs.count() - 1))
                     self.on_phrase_tab_changed(self.phrase_tabs.currentIndex())
+                self.update_global_grouping()
+                self._reposition_phrase_tab_plus()
+                self.apply_theme(self.theme_mode)
                 self.current_session_path = file_path
                 self.status_bar.showMessage(f"Session loaded: {Path(file_path).name}")
             except Exception as e:
@@ -6478,22 +6871,25 @@ class MainWindow(QMainWindow):
         phrase_list.history.set_initial_state([])
         self.phrase_lists[name] = phrase_list
 
+        tab = self._new_phrase_tab(name)
+        self.phrase_tabs.addTab(tab, name)
+        if hasattr(tab.search_widget, "apply_theme"):
+            tab.search_widget.apply_theme(self.current_theme)
+        if hasattr(tab.table, "apply_theme"):
+            tab.table.apply_theme(self.current_theme)
+        self._reposition_phrase_tab_plus()
+
+    def _new_phrase_tab(self, name: str) -> PhraseTab:
+        """Вкладка списка с подключенными сигналами поиска и таблицы"""
         tab = PhraseTab()
         tab.name = name
         tab.search_widget.search_changed.connect(lambda t, o, e: self.on_search_changed(tab, t, o, e))
         tab.search_widget.prev_btn.clicked.connect(lambda: self.prev_search(tab))
         tab.search_widget.next_btn.clicked.connect(lambda: self.next_search(tab))
-        tab.table.phrases_to_folder.connect(
-            lambda fn, phrases, is_global, is_move: self.on_phrases_to_folder(fn, phrases, is_global, is_move))
+        tab.table.phrases_to_folder.connect(self.on_phrases_to_folder)
         tab.table.table_view_changed.connect(lambda: self.on_table_view_changed(tab))
         tab.table.table_data_changed.connect(lambda: self.on_table_data_changed(tab))
-
-        self.phrase_tabs.addTab(tab, name)
-        if hasattr(tab.search_widget, "apply_theme"):
-            tab.search_widget.apply_theme(self.current_theme)
-        if hasattr(tab.table, "apply_theme"):
-            tab.table.apply_theme(self.current_theme)
-        self._reposition_phrase_tab_plus()
+        return tab
 
     def update_current_table_folders(self):
         current_table = self.get_current_table()
@@ -6508,12 +6904,14 @@ class MainWindow(QMainWindow):
 
 
 def main():
-    app = QApplication(sys.argv)
-    app.setStyle('Fusion')
+    # ID устройства (на Windows — вызов wmic) вычисляется параллельно с инициализацией Qt
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        license_future = executor.submit(LicenseManager)
+        app = QApplication(sys.argv)
+        app.setStyle('Fusion')
+        license_manager = license_future.result()
 
     # Проверка лицензии
-    license_manager = LicenseManager()
-
     if not license_manager.is_licensed():
         # Показываем диалог активации
         license_dialog = LicenseDialog(license_manager)